@@ -0,0 +1,142 @@
+# animation_engine.py
+import time
+
+from PyQt5 import QtCore
+
+
+class MoveAnimator(QtCore.QObject):
+    """
+    Drives every rank-change move of a board from a single clock.
+
+    Moves are keyed by any hashable object (a SongCell, a song title...).
+    One timer runs while at least one move is in flight; each tick computes
+    the new rect of every moving key and hands them to apply(frame) in one
+    call, so the caller can set all geometries at once. Retargeting a key
+    that is still moving starts the new move from where the key currently
+    is, so nothing jumps back to its old slot.
+
+    In reduced-motion mode moves complete immediately. The animator also
+    degrades on its own: when ticks keep arriving late it halves the frame
+    rate, and when that is not enough it switches to reduced motion.
+
+    use_clock() hands the clock to the caller instead (offscreen rendering):
+    the timer never runs and the caller calls tick() once per frame.
+    """
+    FRAME_INTERVAL = 16     # ms between frames when the machine keeps up
+    MAX_INTERVAL = 64       # Slowest frame interval before giving up on motion
+    LATE_FRAMES_LIMIT = 10  # Consecutive late frames before degrading
+
+    finished = QtCore.pyqtSignal(list)  # Keys whose move just completed
+
+    def __init__(self, apply, duration, parent=None):
+        """apply is called as apply({key: QRect}) once per frame."""
+        super().__init__(parent)
+        self.apply = apply
+        self.duration = duration
+        self.easing = QtCore.QEasingCurve(QtCore.QEasingCurve.Linear)
+        self.reduced_motion = False
+        self.moves = {}  # key -> (start rect, end rect, start time)
+        self.interval = self.FRAME_INTERVAL
+        self.late_frames = 0
+        self.last_tick = None
+        self.clock = time.monotonic
+        self.external_clock = False
+        self.timer = QtCore.QTimer(self)
+        self.timer.timeout.connect(self.tick)
+
+    def is_active(self):
+        return bool(self.moves)
+
+    def target(self, key):
+        """Where a moving key is heading, or None if it is not moving."""
+        move = self.moves.get(key)
+        return move[1] if move else None
+
+    def current(self, key, now=None):
+        """The interpolated rect of a moving key, or None if it is not moving."""
+        move = self.moves.get(key)
+        if move is None:
+            return None
+        start, end, started = move
+        now = self.clock() if now is None else now
+        progress = min(1.0, (now - started) * 1000 / self.duration)
+        value = self.easing.valueForProgress(progress)
+        return QtCore.QRect(
+            round(start.x() + (end.x() - start.x()) * value),
+            round(start.y() + (end.y() - start.y()) * value),
+            round(start.width() + (end.width() - start.width()) * value),
+            round(start.height() + (end.height() - start.height()) * value)
+        )
+
+    def move(self, key, start, end):
+        """Moves key from start to end; a key already in flight continues from where it is."""
+        now = self.clock()
+        current = self.current(key, now)
+        if current is not None:
+            if self.moves[key][1] == end:
+                return
+            start = current
+        if self.reduced_motion or start == end:
+            self.moves.pop(key, None)
+            self.apply({key: end})
+            self.finished.emit([key])
+            return
+        self.moves[key] = (QtCore.QRect(start), QtCore.QRect(end), now)
+        if not self.timer.isActive() and not self.external_clock:
+            self.last_tick = None
+            self.timer.start(self.interval)
+
+    def cancel(self, key):
+        self.moves.pop(key, None)
+
+    def cancel_all(self):
+        self.moves.clear()
+        self.timer.stop()
+
+    def set_reduced_motion(self, enabled):
+        self.reduced_motion = enabled
+        if enabled and self.moves:
+            # Jump every move in flight to its destination.
+            frame = {key: end for key, (_, end, _) in self.moves.items()}
+            keys = list(self.moves)
+            self.moves.clear()
+            self.timer.stop()
+            self.apply(frame)
+            self.finished.emit(keys)
+
+    def use_clock(self, clock):
+        """Reads time from clock() and leaves frame pacing to the caller, which calls tick()."""
+        self.clock = clock
+        self.external_clock = True
+        self.timer.stop()
+
+    def tick(self):
+        now = self.clock()
+        if self.last_tick is not None and not self.external_clock:
+            elapsed = (now - self.last_tick) * 1000
+            self.late_frames = self.late_frames + 1 if elapsed > self.interval * 1.5 else 0
+            if self.late_frames >= self.LATE_FRAMES_LIMIT:
+                self.late_frames = 0
+                if self.interval < self.MAX_INTERVAL:
+                    self.interval *= 2
+                    self.timer.setInterval(self.interval)
+                else:
+                    self.set_reduced_motion(True)
+                    return
+        self.last_tick = now
+
+        frame = {}
+        done = []
+        for key, (_, end, started) in self.moves.items():
+            if (now - started) * 1000 >= self.duration:
+                frame[key] = end
+                done.append(key)
+            else:
+                frame[key] = self.current(key, now)
+        for key in done:
+            del self.moves[key]
+        if not self.moves:
+            self.timer.stop()
+        self.apply(frame)
+        if done:
+            self.finished.emit(done)
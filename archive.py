@@ -0,0 +1,394 @@
+# archive.py
+"""
+Archive of finished contests (heats, semi-finals, finals) for analysis and replay.
+
+An archive is one compressed .npz file of flat columns shared by all its
+contests; per-contest slices are found through offset columns:
+
+    contest_names, contest_*_offsets   contest c owns rows offsets[c]:offsets[c + 1]
+    points                             each contest's points_sequence
+    song_titles                        songs in original order
+    song_totals, song_ranks            final scores and ranks (0 = winner)
+    juror_names                        jurors in turn order
+    vote_jurors, vote_songs,           one row per point handed out, in the
+    vote_points                        order it was handed out
+
+Votes are the juror x song matrix stored sparsely (a juror gives
+len(points_sequence) votes, however many songs there are); matrix()
+expands one contest. Queries work on whole columns with NumPy, so they
+stay in the millisecond range over thousands of contests.
+
+    python archive.py archive.npz list
+    python archive.py archive.npz blocs
+    python archive.py archive.npz export 3 replay/   # contest.bin + journal.jsonl for main.py --replay
+"""
+import json
+import os
+import sys
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional for the scoreboard; the archive needs it.
+    np = None
+
+from catalog import compile_contest
+from game import create_game
+
+COLUMNS = (
+    "contest_names", "contest_song_offsets", "contest_juror_offsets", "contest_vote_offsets",
+    "contest_points_offsets", "points", "song_titles", "song_totals", "song_ranks", "juror_names",
+    "vote_jurors", "vote_songs", "vote_points",
+)
+
+
+class VoteRecorder:
+    """
+    Records who gave which points to which song while a game is played.
+
+    Every turn's votes are kept in the order they were handed out, one
+    vote per point index. A restore (undo, history seek) only moves the
+    game's position: the votes past it are kept for a redo (or the undo
+    of a reset), and the first new vote cast from there replaces them, as
+    in the history. A finalized turn keeps the votes up to the point it
+    was finalized at.
+    """
+    def __init__(self, game):
+        if np is None:
+            raise RuntimeError("VoteRecorder requires NumPy")
+        self.game = game
+        self.turns = {}  # player index -> [(song index, points), ...] in point order
+        self.point_index = game.current_point_index  # The game's point index after the last event
+        game.add_listener(self.on_game_event)
+
+    def on_game_event(self, event, *args):
+        index_of = self.game.original_order
+        if event in ("assign", "ballot"):
+            entries = [args] if event == "assign" else args[0]
+            self.cast([(index_of[song], points) for song, points in entries])
+        elif event == "finalize":
+            player = self.finalized_players() - 1
+            self.turns[player] = self.turns.get(player, [])[:self.point_index]
+        elif event == "restore":
+            game = self.game
+            turn = self.turns.get(game.current_player_index, [])
+            if len(turn) < game.current_point_index:
+                # A state restored from outside (journal snapshot) whose votes were never seen:
+                # the best left is one vote per song of the current turn.
+                self.turns[game.current_player_index] = [
+                    (index_of[song], game.current_scores[song]) for song in game.songs if game.current_scores[song]]
+        self.point_index = self.game.current_point_index
+
+    def cast(self, votes):
+        game = self.game
+        start = game.current_point_index - len(votes)
+        turn = self.turns.get(game.current_player_index, [])
+        self.turns[game.current_player_index] = turn[:start] + votes
+
+    def finalized_players(self):
+        return self.game.current_player_index + (1 if self.game.game_over else 0)
+
+    def votes(self):
+        """(juror, song, points) arrays of the finalized turns, in turn order."""
+        finalized = self.finalized_players()
+        rows = [(player, song, points)
+                for player in sorted(self.turns) if player < finalized for song, points in self.turns[player]]
+        columns = np.array(rows, dtype=np.int64).reshape(-1, 3).T
+        return columns[0], columns[1], columns[2]
+
+
+def final_ranks(totals):
+    """Rank of every song (0 = winner); ties go to the earlier song, as on the scoreboard."""
+    totals = np.asarray(totals, dtype=np.int64)
+    order = np.lexsort((np.arange(len(totals)), -totals))
+    ranks = np.empty(len(totals), dtype=np.int32)
+    ranks[order] = np.arange(len(totals), dtype=np.int32)
+    return ranks
+
+
+class Archive:
+    """Contests stored as flat columns (see the module docstring)."""
+    def __init__(self, path=None):
+        """Loads the archive at path, or starts an empty one."""
+        if np is None:
+            raise RuntimeError("Archive requires NumPy")
+        self.path = path
+        if path is not None and os.path.exists(path):
+            with np.load(path, allow_pickle=False) as data:
+                self.columns = {name: data[name] for name in COLUMNS}
+        else:
+            self.columns = {name: np.zeros(1 if name.endswith("_offsets") else 0,
+                                           dtype=np.str_ if name.endswith("_names") or name == "song_titles"
+                                           else np.int64)
+                            for name in COLUMNS}
+        self.juror_ids = None  # Cached (names, juror row -> name id), see juror_identities
+
+    def __len__(self):
+        return len(self.columns["contest_names"])
+
+    def __getattr__(self, name):
+        try:
+            return self.__dict__["columns"][name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def save(self, path=None):
+        self.path = path or self.path
+        with open(self.path, "wb") as f:
+            np.savez_compressed(f, **self.columns)
+
+    # --- Adding contests ---
+    def add(self, name, songs, jurors, points_sequence, votes):
+        """
+        Appends a contest: songs in original order, jurors in turn order and
+        votes as (juror index, song index, points) arrays. Returns its index.
+        """
+        juror_column, song_column, points_column = (np.asarray(v, dtype=np.int64) for v in votes)
+        totals = np.bincount(song_column, weights=points_column, minlength=len(songs)).astype(np.int64)
+        columns = self.columns
+        song_base = columns["contest_song_offsets"][-1]
+        juror_base = columns["contest_juror_offsets"][-1]
+
+        def extend(column, values, dtype=None):
+            columns[column] = np.concatenate([columns[column], np.asarray(values, dtype=dtype)])
+        extend("contest_names", [name], np.str_)
+        extend("contest_song_offsets", [song_base + len(songs)], np.int64)
+        extend("contest_juror_offsets", [juror_base + len(jurors)], np.int64)
+        extend("contest_vote_offsets", [columns["contest_vote_offsets"][-1] + len(song_column)], np.int64)
+        extend("contest_points_offsets", [columns["contest_points_offsets"][-1] + len(points_sequence)], np.int64)
+        extend("points", points_sequence, np.int64)
+        extend("song_titles", list(songs), np.str_)
+        extend("song_totals", totals, np.int64)
+        extend("song_ranks", final_ranks(totals), np.int64)
+        extend("juror_names", list(jurors), np.str_)
+        extend("vote_jurors", juror_column + juror_base, np.int64)
+        extend("vote_songs", song_column + song_base, np.int64)
+        extend("vote_points", points_column, np.int64)
+        self.juror_ids = None
+        return len(self) - 1
+
+    def add_game(self, name, game, recorder):
+        """Appends a game played with a VoteRecorder attached."""
+        return self.add(name, game.songs, game.players, game.points_sequence, recorder.votes())
+
+    # --- One contest ---
+    def span(self, column, contest):
+        offsets = self.columns[f"contest_{column}_offsets"]
+        return slice(offsets[contest], offsets[contest + 1])
+
+    def songs(self, contest):
+        return self.song_titles[self.span("song", contest)].tolist()
+
+    def jurors(self, contest):
+        return self.juror_names[self.span("juror", contest)].tolist()
+
+    def points_sequence(self, contest):
+        return self.points[self.span("points", contest)].tolist()
+
+    def contest_votes(self, contest):
+        """(juror, song, points) arrays of a contest, with indices local to it."""
+        votes = self.span("vote", contest)
+        return (self.vote_jurors[votes] - self.contest_juror_offsets[contest],
+                self.vote_songs[votes] - self.contest_song_offsets[contest],
+                self.vote_points[votes])
+
+    def matrix(self, contest):
+        """The jurors x songs matrix of points given in a contest."""
+        jurors, songs, points = self.contest_votes(contest)
+        shape = (len(self.jurors(contest)), len(self.songs(contest)))
+        matrix = np.zeros(shape, dtype=np.int64)
+        np.add.at(matrix, (jurors, songs), points)
+        return matrix
+
+    def ballots(self, contest):
+        """[(juror, [(song, points), ...]), ...] in turn order, as handed out."""
+        jurors, songs, points = self.contest_votes(contest)
+        names, titles = self.jurors(contest), self.songs(contest)
+        ballots = [(name, []) for name in names]
+        for juror, song, value in zip(jurors.tolist(), songs.tolist(), points.tolist()):
+            ballots[juror][1].append((titles[song], value))
+        return ballots
+
+    def ranking(self, contest):
+        """Song titles of a contest, winner first."""
+        songs = self.span("song", contest)
+        return self.song_titles[songs][np.argsort(self.song_ranks[songs], kind="stable")].tolist()
+
+    # --- Queries ---
+    def juror_agreement(self, contest):
+        """
+        jurors x jurors cosine similarity of the jurors' point vectors in a
+        contest (1.0: same songs, same proportions; 0.0: no song in common).
+        """
+        matrix = self.matrix(contest).astype(np.float64)
+        norms = np.linalg.norm(matrix, axis=1)
+        norms[norms == 0] = 1.0
+        return (matrix @ matrix.T) / np.outer(norms, norms)
+
+    def rank_trajectories(self, contest):
+        """jurors x songs matrix: every song's rank (0 = first) after each juror's turn."""
+        cumulative = np.cumsum(self.matrix(contest), axis=0)
+        n = cumulative.shape[1]
+        # Higher score first, then original order: one sortable key per cell.
+        keys = -cumulative * n + np.arange(n)
+        order = np.argsort(keys, axis=1)
+        ranks = np.empty_like(order)
+        np.put_along_axis(ranks, order, np.arange(n)[None, :].repeat(len(order), axis=0), axis=1)
+        return ranks
+
+    def rank_trajectory(self, contest, song):
+        """A song's rank after each juror's turn; song is a title or an original index."""
+        if isinstance(song, str):
+            song = self.songs(contest).index(song)
+        cumulative = np.cumsum(self.matrix(contest), axis=0)
+        scores = cumulative[:, song:song + 1]
+        ahead = (cumulative > scores).sum(axis=1)
+        tied_before = (cumulative[:, :song] == scores).sum(axis=1)
+        return ahead + tied_before
+
+    def song_results(self, title):
+        """[(contest name, rank, total), ...] of every contest the title took part in."""
+        rows = np.flatnonzero(self.song_titles == title)
+        contests = np.searchsorted(self.contest_song_offsets, rows, side="right") - 1
+        return list(zip(self.contest_names[contests].tolist(), self.song_ranks[rows].tolist(),
+                        self.song_totals[rows].tolist()))
+
+    def juror_identities(self):
+        """(distinct juror names, name id of every juror row), cached."""
+        if self.juror_ids is None:
+            self.juror_ids = np.unique(self.juror_names, return_inverse=True)
+        return self.juror_ids
+
+    def name_agreement(self):
+        """
+        Agreement between juror names over the whole archive: (names,
+        similarity, shared) where similarity is the cosine similarity of the
+        names' points over every (contest, song) and shared counts the
+        contests in which both names voted.
+        """
+        names, name_of_row = self.juror_identities()
+        k = len(names)
+        voter = name_of_row[self.vote_jurors]
+        # Sum the points of repeated votes (same name, same song) first.
+        cells, inverse = np.unique(voter * len(self.song_titles) + self.vote_songs, return_inverse=True)
+        points = np.bincount(inverse, weights=self.vote_points).astype(np.float64)
+        cell_voter, cell_song = cells // len(self.song_titles), cells % len(self.song_titles)
+        # Self-join the cells on the song: every pair of names that scored the same song.
+        order = np.argsort(cell_song, kind="stable")
+        cell_voter, cell_song, points = cell_voter[order], cell_song[order], points[order]
+        starts = np.flatnonzero(np.r_[True, cell_song[1:] != cell_song[:-1]])
+        sizes = np.diff(np.r_[starts, len(cell_song)])
+        # Each cell pairs with every cell of its group (itself included).
+        group_size, group_start = np.repeat(sizes, sizes), np.repeat(starts, sizes)
+        first = np.repeat(np.arange(len(cell_song)), group_size)
+        run_start = np.repeat(np.cumsum(group_size) - group_size, group_size)
+        second = np.repeat(group_start, group_size) + np.arange(len(first)) - run_start
+        products = np.bincount(cell_voter[first] * k + cell_voter[second],
+                               weights=points[first] * points[second], minlength=k * k).reshape(k, k)
+        norms = np.sqrt(np.diag(products))
+        norms[norms == 0] = 1.0
+        similarity = products / np.outer(norms, norms)
+        # Contests in which both names voted.
+        juror_contest = np.searchsorted(self.contest_juror_offsets, np.arange(len(self.juror_names)),
+                                        side="right") - 1
+        attended = np.zeros((k, max(1, len(self))), dtype=np.float64)
+        attended[name_of_row, juror_contest] = 1.0
+        return names.tolist(), similarity, (attended @ attended.T).astype(np.int64)
+
+    def voting_blocs(self, min_shared=3, z=2.0, min_similarity=0.5):
+        """
+        Pairs of juror names that agree far more than jurors usually do:
+        [(name, name, similarity, shared contests), ...], most similar first.
+        A pair is reported when it voted together in at least min_shared
+        contests and its similarity is at least min_similarity and z standard
+        deviations above the mean of all such pairs.
+        """
+        names, similarity, shared = self.name_agreement()
+        first, second = np.triu_indices(len(names), 1)
+        eligible = shared[first, second] >= min_shared
+        first, second = first[eligible], second[eligible]
+        if not len(first):
+            return []
+        values = similarity[first, second]
+        threshold = max(min_similarity, values.mean() + z * values.std())
+        flagged = np.flatnonzero(values > threshold)
+        flagged = flagged[np.argsort(-values[flagged], kind="stable")]
+        return [(names[first[i]], names[second[i]], float(values[i]), int(shared[first[i], second[i]]))
+                for i in flagged]
+
+    # --- Replay ---
+    def load_game(self, contest, path):
+        """
+        A new game with the songs, jurors and points_sequence of an archived
+        contest, opened from a compiled contest file written to path.
+        """
+        compile_contest(self.songs(contest), self.jurors(contest), path)
+        game = create_game(path)
+        game.points_sequence = self.points_sequence(contest)
+        return game
+
+    def replay(self, contest, game, turns=None):
+        """
+        Plays the archived ballots (the first turns jurors, or all) into game,
+        each with the points recorded for it. A complete replay must end on
+        the archived final totals; ValueError is raised otherwise.
+        """
+        for juror, ballot in self.ballots(contest)[:turns]:
+            if game.game_over or not ballot:
+                break  # Jurors after the last finalized turn have no votes.
+            game.assign_points_batch(juror, ballot)
+            game.finalize_turn()
+        if turns is None:
+            totals = [game.total_scores[song] for song in game.songs]
+            if totals != self.song_totals[self.span("song", contest)].tolist():
+                raise ValueError(f"Replaying contest {contest} does not reproduce its archived totals")
+
+    def export_journal(self, contest, path, interval=2.0):
+        """Writes the contest as a vote journal (one ballot every interval seconds) for main.py --replay."""
+        with open(path, "w", encoding="utf-8") as f:
+            def write(seq, record):
+                record.update(seq=seq, t=seq * interval)
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            write(0, {"event": "start", "songs": len(self.songs(contest)), "players": len(self.jurors(contest))})
+            seq = 1
+            for juror, ballot in self.ballots(contest):
+                if not ballot:
+                    break
+                write(seq, {"event": "ballot", "player": juror,
+                            "ballot": [[song, points] for song, points in ballot]})
+                write(seq + 1, {"event": "finalize"})
+                seq += 2
+
+
+def main(argv):
+    if len(argv) < 2:
+        print("usage: python archive.py ARCHIVE.npz list | blocs | export INDEX DIRECTORY", file=sys.stderr)
+        return 2
+    archive = Archive(argv[0])
+    command = argv[1]
+    if command == "list":
+        for i, name in enumerate(archive.contest_names.tolist()):
+            print(f"{i}: {name} ({len(archive.songs(i))} songs, {len(archive.jurors(i))} jurors), "
+                  f"winner {archive.ranking(i)[0] if archive.songs(i) else '-'}")
+    elif command == "blocs":
+        for first, second, similarity, shared in archive.voting_blocs():
+            print(f"{first} / {second}: similarity {similarity:.2f} over {shared} contests")
+    elif command == "export" and len(argv) == 4:
+        contest, directory = int(argv[2]), argv[3]
+        os.makedirs(directory, exist_ok=True)
+        # Checks that the archived ballots replay to the archived results before exporting them.
+        try:
+            archive.replay(contest, archive.load_game(contest, os.path.join(directory, "contest.bin")))
+        except ValueError as error:
+            print(f"Error: {error}", file=sys.stderr)
+            return 1
+        archive.export_journal(contest, os.path.join(directory, "journal.jsonl"))
+        print(f"python main.py --contest {os.path.join(directory, 'contest.bin')} "
+              f"--replay {os.path.join(directory, 'journal.jsonl')}")
+    else:
+        print(f"Unknown command {command!r}", file=sys.stderr)
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
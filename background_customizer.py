@@ -1,16 +1,49 @@
 from PyQt5 import QtGui, QtCore
+from resources import background_cache
 
-class BackgroundCustomizer:
+class BackgroundCustomizer(QtCore.QObject):
     def __init__(self, background_image_path=None, background_color=QtGui.QColor(255, 255, 255)):
+        super().__init__()
         self.background_image_path = background_image_path
         self.background_color = background_color
+        self.widgets = {}  # widget -> widget whose size its image is scaled to
 
-    def apply_background(self, widget):
+    def apply_background(self, widget, size_widget=None):
+        """
+        size_widget (default: widget itself) is the widget the image is scaled
+        to cover; the image is tiled over the rest of widget. A scrolled board
+        passes the viewport, so the image stays the size of the screen rather
+        than of the whole board.
+        """
         palette = widget.palette()
         if self.background_image_path:
-            pixmap = QtGui.QPixmap(self.background_image_path)
-            palette.setBrush(widget.backgroundRole(), QtGui.QBrush(pixmap))
+            # The image is decoded and scaled off the UI thread (see
+            # resources.BackgroundImageCache) and follows size_widget's size.
+            size_widget = size_widget or widget
+            if widget not in self.widgets:
+                self.widgets[widget] = size_widget
+                size_widget.installEventFilter(self)
+            self.request_image(widget)
         elif self.background_color:
             palette.setColor(widget.backgroundRole(), self.background_color)
         widget.setPalette(palette)
-        widget.setAutoFillBackground(True)
\ No newline at end of file
+        widget.setAutoFillBackground(True)
+
+    def request_image(self, widget):
+        size_widget = self.widgets[widget]
+        size = size_widget.size()
+
+        def show(pixmap):
+            if size_widget.size() != size:
+                return  # Resized meanwhile; the newer request will follow.
+            palette = widget.palette()
+            palette.setBrush(widget.backgroundRole(), QtGui.QBrush(pixmap))
+            widget.setPalette(palette)
+        background_cache().request(self.background_image_path, size, show)
+
+    def eventFilter(self, obj, event):
+        if event.type() == QtCore.QEvent.Resize:
+            for widget, size_widget in self.widgets.items():
+                if size_widget is obj:
+                    self.request_image(widget)
+        return False
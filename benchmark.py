@@ -0,0 +1,324 @@
+# benchmark.py
+"""
+Headless benchmark of the game engine and the spectator board.
+
+Each scenario generates synthetic songs.txt/players.txt files, opens the
+presenter and spectator windows on Qt's offscreen platform and plays a
+full contest through PresenterWindow, one click per point. It reports:
+
+  - vote-to-paint latency: from a presenter click to the first spectator
+    paint that shows it
+  - layout time (SpectatorContainer.update_layout) and finalize time
+    (Game.finalize_turn)
+  - frame time: interval between two frames of the rank-change animation
+  - widget count and peak resident memory
+
+Every scenario runs in its own process so memory peaks do not add up.
+
+    python benchmark.py --sizes 10 100 1000 --output results.json
+    python benchmark.py --compare baseline.json   # exits 1 on regressions
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+try:
+    import resource
+except ImportError:  # Not available on Windows; peak memory is then not reported.
+    resource = None
+
+DEFAULT_SIZES = [10, 100, 1000, 10000]
+DEFAULT_PLAYERS = 10
+DEFAULT_THRESHOLD = 0.2  # Relative slowdown that counts as a regression
+MIN_DELTA_MS = 1.0       # Timing changes smaller than this are noise, whatever their ratio
+SETTLE_TIMEOUT = 10.0    # Max seconds to wait for a vote to be painted or a move to end
+
+# Metrics compared against a baseline; for all of them lower is better.
+COMPARED_METRICS = [
+    "setup_ms", "vote_to_paint_ms.p50", "vote_to_paint_ms.p90", "layout_ms.p50",
+    "layout_ms.p90", "frame_ms.p90", "finalize_ms.p90", "widgets", "peak_rss_kb",
+]
+
+
+def generate_inputs(directory, songs, players, seed=0):
+    """Writes songs.txt and players.txt with synthetic names; returns their paths."""
+    rng = random.Random(seed)
+    songs_path = os.path.join(directory, "songs.txt")
+    players_path = os.path.join(directory, "players.txt")
+    with open(songs_path, "w", encoding="utf-8") as f:
+        for i in range(songs):
+            f.write(f"Song {i + 1} {rng.choice(['Love', 'Night', 'Fire', 'Песня'])} - Artist {rng.randrange(songs)}\n")
+    with open(players_path, "w", encoding="utf-8") as f:
+        for i in range(players):
+            f.write(f"Juror {i + 1}\n")
+    return songs_path, players_path
+
+
+def percentiles(samples):
+    """p50/p90/p99/max of a list of milliseconds (None when empty)."""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+
+    def at(fraction):
+        return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))], 3)
+    return {"count": len(ordered), "p50": at(0.5), "p90": at(0.9), "p99": at(0.99),
+            "max": round(ordered[-1], 3)}
+
+
+def peak_rss_kb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak  # macOS reports bytes
+
+
+class ContestRecorder:
+    """Times a scripted contest: wraps the measured methods and watches spectator paints."""
+    def __init__(self, app, game, spectator, presenter):
+        from PyQt5 import QtCore
+
+        self.app = app
+        self.game = game
+        self.spectator = spectator
+        self.presenter = presenter
+        self.layout_ms = []
+        self.finalize_ms = []
+        self.vote_to_paint_ms = []
+        self.frame_ms = []
+        self.pending_vote = None  # (click time, scheduler flush count at the click)
+        self.last_frame = None
+        self.wrap(spectator.container, "update_layout", self.layout_ms)
+        # Frame time: interval between two animation frames of the move animator.
+        animator = spectator.container.animator
+        self.apply_frame = animator.apply
+        animator.apply = self.on_frame
+        self.wrap(game, "finalize_turn", self.finalize_ms)
+
+        recorder = self
+
+        class PaintWatcher(QtCore.QObject):
+            def eventFilter(self, obj, event):
+                if event.type() == QtCore.QEvent.Paint and obj.isWidgetType() and (
+                        obj is recorder.spectator or recorder.spectator.isAncestorOf(obj)):
+                    recorder.on_paint()
+                return False
+
+        self.watcher = PaintWatcher()
+        app.installEventFilter(self.watcher)
+
+    def wrap(self, owner, name, samples):
+        method = getattr(owner, name)
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                samples.append((time.perf_counter() - start) * 1000)
+        setattr(owner, name, timed)
+
+    def on_paint(self):
+        now = time.perf_counter()
+        # The first paint after the scheduler applied a pending vote shows it.
+        if self.pending_vote is not None and self.spectator.scheduler.flushed > self.pending_vote[1]:
+            self.vote_to_paint_ms.append((now - self.pending_vote[0]) * 1000)
+            self.pending_vote = None
+
+    def on_frame(self, frame):
+        now = time.perf_counter()
+        if self.last_frame is not None:
+            self.frame_ms.append((now - self.last_frame) * 1000)
+        self.last_frame = now if self.spectator.container.animator.is_active() else None
+        self.apply_frame(frame)
+
+    def wait(self, done):
+        from PyQt5 import QtCore
+
+        deadline = time.perf_counter() + SETTLE_TIMEOUT
+        while not done() and time.perf_counter() < deadline:
+            self.app.processEvents(QtCore.QEventLoop.AllEvents, 5)
+            time.sleep(0.0005)
+
+    def vote(self, song):
+        self.pending_vote = (time.perf_counter(), self.spectator.scheduler.flushed)
+        self.presenter.assign_point(song)
+        self.wait(lambda: self.pending_vote is None)
+
+    def finalize(self):
+        self.presenter.finalize_turn()
+        self.spectator.scheduler.flush()
+        self.wait(lambda: not self.spectator.container.animator.is_active())
+
+
+def run_scenario(songs, players, painted=False, seed=0):
+    """Plays one full synthetic contest and returns its measurements."""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5 import QtWidgets
+    from game import create_game
+    from presenter_window import PresenterWindow
+    from spectator_window import SpectatorWindow
+
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    rng = random.Random(seed)
+    with tempfile.TemporaryDirectory() as directory:
+        songs_path, players_path = generate_inputs(directory, songs, players, seed)
+        start = time.perf_counter()
+        game = create_game(songs_path, players_path)
+        spectator = SpectatorWindow(game, painted=painted)
+        presenter = PresenterWindow(game, spectator)
+        spectator.show()
+        presenter.show()
+        app.processEvents()
+        setup_ms = (time.perf_counter() - start) * 1000
+
+    recorder = ContestRecorder(app, game, spectator, presenter)
+    contest_start = time.perf_counter()
+    while not game.game_over:
+        for song in rng.sample(game.songs, min(len(game.points_sequence), len(game.songs))):
+            recorder.vote(song)
+        recorder.finalize()
+    contest_s = time.perf_counter() - contest_start
+
+    widgets = len(spectator.findChildren(QtWidgets.QWidget)) + len(presenter.findChildren(QtWidgets.QWidget))
+    # Tear the windows down while the application still exists.
+    app.removeEventFilter(recorder.watcher)
+    for window in (presenter, spectator):
+        window.close()
+        window.deleteLater()
+    app.processEvents()
+    return {
+        "songs": songs,
+        "players": players,
+        "mode": "painted" if painted else ("virtual" if spectator.container.virtual else "widgets"),
+        "setup_ms": round(setup_ms, 3),
+        "contest_s": round(contest_s, 3),
+        "vote_to_paint_ms": percentiles(recorder.vote_to_paint_ms),
+        "layout_ms": percentiles(recorder.layout_ms),
+        "frame_ms": percentiles(recorder.frame_ms),
+        "finalize_ms": percentiles(recorder.finalize_ms),
+        "widgets": widgets,
+        "peak_rss_kb": peak_rss_kb(),
+    }
+
+
+def run_isolated(songs, players, painted, seed):
+    """Runs one scenario in a fresh interpreter and returns its result."""
+    command = [sys.executable, os.path.abspath(__file__), "--scenario",
+               str(songs), str(players), "1" if painted else "0", str(seed)]
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    output = subprocess.run(command, check=True, capture_output=True, text=True, env=env,
+                            cwd=os.path.dirname(os.path.abspath(__file__))).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def environment():
+    from PyQt5 import QtCore
+    return {
+        "python": platform.python_version(),
+        "qt": QtCore.QT_VERSION_STR,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+# --- Baseline comparison ---
+def metric(result, name):
+    value = result
+    for part in name.split("."):
+        if not isinstance(value, dict) or value.get(part) is None:
+            return None
+        value = value[part]
+    return value
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Returns a list of regressions: metrics that are more than threshold
+    (relative) worse than in the baseline run of the same scenario.
+    """
+    by_scenario = {(r["songs"], r["players"], r["mode"]): r for r in baseline["results"]}
+    regressions = []
+    for result in results["results"]:
+        reference = by_scenario.get((result["songs"], result["players"], result["mode"]))
+        if reference is None:
+            continue
+        for name in COMPARED_METRICS:
+            old, new = metric(reference, name), metric(result, name)
+            if old is None or new is None or old <= 0:
+                continue
+            change = (new - old) / old
+            if "_ms" in name and new - old < MIN_DELTA_MS:
+                continue
+            if change > threshold:
+                regressions.append({
+                    "songs": result["songs"], "players": result["players"], "mode": result["mode"],
+                    "metric": name, "baseline": old, "current": new, "change": round(change, 3),
+                })
+    return regressions
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Headless scoreboard benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help=f"numbers of songs to benchmark (default: {DEFAULT_SIZES})")
+    parser.add_argument("--players", type=int, default=DEFAULT_PLAYERS,
+                        help=f"jurors per contest (default: {DEFAULT_PLAYERS})")
+    parser.add_argument("--painted", action="store_true",
+                        help="also benchmark the painted spectator board")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", metavar="PATH", help="write the results as JSON to PATH")
+    parser.add_argument("--compare", metavar="BASELINE",
+                        help="compare against a stored result file; exit 1 on regressions")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"relative slowdown reported as a regression (default: {DEFAULT_THRESHOLD})")
+    parser.add_argument("--scenario", nargs=4, metavar=("SONGS", "PLAYERS", "PAINTED", "SEED"),
+                        help=argparse.SUPPRESS)  # Internal: run one scenario in this process
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    if args.scenario:
+        songs, players, painted, seed = (int(value) for value in args.scenario)
+        print(json.dumps(run_scenario(songs, players, bool(painted), seed)))
+        return 0
+
+    results = {"environment": environment(), "results": []}
+    for songs in args.sizes:
+        for painted in ([False, True] if args.painted else [False]):
+            result = run_isolated(songs, args.players, painted, args.seed)
+            results["results"].append(result)
+            print(f"{result['mode']:>8} {songs:>6} songs: setup {result['setup_ms']:.0f} ms, "
+                  f"vote-to-paint p90 {metric(result, 'vote_to_paint_ms.p90')} ms, "
+                  f"layout p90 {metric(result, 'layout_ms.p90')} ms, "
+                  f"{result['widgets']} widgets, peak {result['peak_rss_kb']} KB",
+                  file=sys.stderr)
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        for r in regressions:
+            print(f"REGRESSION {r['mode']} {r['songs']} songs: {r['metric']} "
+                  f"{r['baseline']} -> {r['current']} (+{r['change']:.0%})", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,354 @@
+# broadcast.py
+"""
+Offscreen broadcast rendering of the spectator board.
+
+The board is rendered into QImages at a fixed frame rate, without a
+visible window, and the frames are handed to an EncoderPipeline whose
+worker threads write them to a sink: a PNG sequence, raw BGRA frames on
+a pipe or file, or an ffmpeg process.
+
+BroadcastRenderer follows a live Game in real time. prerender() replays a
+vote journal on its own clock, as fast as rendering and encoding allow:
+
+    python broadcast.py journal.jsonl out.mp4 --fps 30 --size 1920x1080
+    python broadcast.py journal.jsonl frames/ --speed 4
+"""
+import argparse
+import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+from game import create_game
+from journal import JournalReplayer, apply_event, check_header, read_events, read_header, record_songs
+from presenter_window import game_info_text
+from spectator_window import MOVE_DURATION, PaintedSpectatorContainer, SpectatorContainer
+
+DEFAULT_SIZE = (1920, 1080)
+DEFAULT_FPS = 30
+
+
+# --- Sinks ---
+class PngSequenceSink:
+    """Writes frame_000000.png, frame_000001.png... into a directory (any order)."""
+    ordered = False
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def write(self, index, image):
+        image.save(os.path.join(self.directory, f"frame_{index:06d}.png"), "PNG")
+
+    def close(self):
+        pass
+
+
+class RawSink:
+    """
+    Writes raw frames, one after the other, to a binary stream: 32-bit
+    pixels in B, G, R, A byte order (ffmpeg's "bgra").
+    """
+    ordered = True
+
+    def __init__(self, stream, close_stream=False):
+        self.stream = stream
+        self.close_stream = close_stream
+
+    def write(self, index, image):
+        bits = image.constBits()
+        bits.setsize(image.sizeInBytes())
+        self.stream.write(bytes(bits))
+
+    def close(self):
+        self.stream.flush()
+        if self.close_stream:
+            self.stream.close()
+
+
+class FfmpegSink(RawSink):
+    """Pipes raw frames into an ffmpeg process that encodes them to path."""
+    def __init__(self, path, size, fps, ffmpeg="ffmpeg", codec_args=("-c:v", "libx264", "-pix_fmt", "yuv420p")):
+        width, height = size
+        self.process = subprocess.Popen(
+            [ffmpeg, "-loglevel", "error", "-y", "-f", "rawvideo", "-pix_fmt", "bgra",
+             "-s", f"{width}x{height}", "-r", str(fps), "-i", "-", *codec_args, path],
+            stdin=subprocess.PIPE
+        )
+        super().__init__(self.process.stdin, close_stream=True)
+
+    def close(self):
+        super().close()
+        self.process.wait()
+
+
+def open_sink(target, size, fps):
+    """Sink for a target: "-" (raw to stdout), *.raw/*.bgra (raw file), a video file or a directory."""
+    if target == "-":
+        return RawSink(sys.stdout.buffer)
+    extension = os.path.splitext(target)[1].lower()
+    if extension in (".raw", ".bgra"):
+        return RawSink(open(target, "wb"), close_stream=True)
+    if extension:
+        return FfmpegSink(target, size, fps)
+    return PngSequenceSink(target)
+
+
+# --- Encoding ---
+class EncoderPipeline:
+    """
+    Encodes frames in worker threads.
+
+    submit() queues a frame for the sink. Live rendering must not wait for
+    the encoder, so a frame that finds the queue full is dropped (and
+    counted); pre-rendering passes block=True and never drops. Sinks that
+    need frames in order get a single worker.
+    """
+    def __init__(self, sink, workers=2, max_queue=8):
+        self.sink = sink
+        self.queue = queue.Queue(max_queue)
+        self.dropped = 0
+        self.encoded = 0
+        self.lock = threading.Lock()
+        self.threads = [
+            threading.Thread(target=self.run, name=f"encoder-{i}", daemon=True)
+            for i in range(1 if sink.ordered else max(1, workers))
+        ]
+        for thread in self.threads:
+            thread.start()
+
+    def submit(self, index, image, block=False):
+        try:
+            self.queue.put((index, image), block=block)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            index, image = item
+            self.sink.write(index, image)
+            with self.lock:
+                self.encoded += 1
+
+    def close(self):
+        """Waits for the queued frames to be written and closes the sink."""
+        for _ in self.threads:
+            self.queue.put(None)
+        for thread in self.threads:
+            thread.join()
+        self.sink.close()
+
+
+# --- Rendering ---
+class BoardRenderer:
+    """
+    A spectator board living offscreen: never shown on a screen, rendered
+    into QImages of a fixed size. It follows its game's events the way
+    SpectatorWindow does (highlight, refresh, layout, status line) and can
+    run on its own clock (see use_clock).
+    """
+    def __init__(self, game, size=DEFAULT_SIZE, painted=True):
+        self.game = game
+        self.width, self.height = size
+        if painted:
+            self.container = PaintedSpectatorContainer(game)
+        else:
+            self.container = SpectatorContainer(game, virtual=True)
+        self.container.setAttribute(QtCore.Qt.WA_DontShowOnScreen)
+        self.container.show()
+        # The board is as tall as its content; frames show the top of it.
+        self.container.resize(self.width, max(self.height, self.container.minimumHeight()))
+        self.container.set_viewport(QtCore.QRect(0, 0, self.width, self.height))
+        self.changed = True
+        game.add_listener(self.on_game_event)
+
+    def on_game_event(self, event, *args):
+        if event in ("assign", "ballot"):
+            self.container.last_voted_song = self.game.highlighted_song([args] if event == "assign" else args[0])
+        self.changed = True
+
+    def use_clock(self, clock):
+        self.container.animator.use_clock(clock)
+
+    def render(self, seconds=None):
+        """Renders the current frame; seconds positions the background sweep on an external clock."""
+        if self.changed:
+            self.changed = False
+            self.container.refresh_cells()
+            self.container.update_layout(initial=False)
+            self.container.info_cell.update_status(game_info_text(self.game))
+        if self.container.animator.external_clock and self.container.animator.is_active():
+            self.container.animator.tick()
+        if seconds is not None:
+            self.container.shimmer.seek(seconds)
+        image = QtGui.QImage(self.width, self.height, QtGui.QImage.Format_RGB32)
+        self.container.render(image, QtCore.QPoint(), QtGui.QRegion(0, 0, self.width, self.height))
+        return image
+
+    def close(self):
+        self.game.remove_listener(self.on_game_event)
+        self.container.close()
+
+
+class BroadcastRenderer(QtCore.QObject):
+    """
+    Renders a live game at a fixed frame rate into an EncoderPipeline.
+
+    Frames are paced on the monotonic clock: each tick renders the frame of
+    the current slot. Slots missed because the GUI thread was busy are
+    filled with the previous frame (counted as repeated), so the stream
+    keeps its timing; frames the encoder cannot take are dropped.
+    """
+    def __init__(self, game, pipeline, size=DEFAULT_SIZE, fps=DEFAULT_FPS, painted=True, parent=None):
+        super().__init__(parent)
+        self.board = BoardRenderer(game, size, painted)
+        self.pipeline = pipeline
+        self.fps = fps
+        self.frames = 0    # Frames rendered
+        self.repeated = 0  # Missed slots filled with the previous frame
+        self.render_time = 0.0
+        self.started = None
+        self.next_slot = 0
+        self.last_image = None
+        self.timer = QtCore.QTimer(self)
+        self.timer.setTimerType(QtCore.Qt.PreciseTimer)
+        self.timer.timeout.connect(self.tick)
+
+    def start(self):
+        self.started = time.monotonic()
+        self.next_slot = 0
+        self.timer.start(max(1, int(1000 / self.fps)))
+
+    def stop(self):
+        self.timer.stop()
+        self.pipeline.close()
+
+    def tick(self):
+        slot = int((time.monotonic() - self.started) * self.fps)
+        if slot < self.next_slot:
+            return  # Early tick; this slot already has its frame.
+        if self.last_image is not None:
+            while self.next_slot < slot:
+                self.pipeline.submit(self.next_slot, self.last_image)
+                self.next_slot += 1
+                self.repeated += 1
+        start = time.perf_counter()
+        image = self.board.render(time.monotonic() - self.started)
+        self.render_time += time.perf_counter() - start
+        self.pipeline.submit(slot, image)
+        self.frames += 1
+        self.last_image = image
+        self.next_slot = slot + 1
+
+    def stats(self):
+        return {
+            "frames": self.frames,
+            "repeated": self.repeated,
+            "dropped": self.pipeline.dropped,
+            "encoded": self.pipeline.encoded,
+            "render_ms": 1000 * self.render_time / self.frames if self.frames else None,
+        }
+
+
+def prerender(game, journal_path, pipeline, size=DEFAULT_SIZE, fps=DEFAULT_FPS, speed=1.0, painted=True):
+    """
+    Replays a vote journal on a fresh game and renders every frame of it,
+    faster than real time when the machine allows. Pauses are shortened as
+    in JournalReplayer. Returns the number of frames rendered. Raises
+    ValueError, before rendering anything, if the journal was not written
+    for the game's songs. The pipeline is closed in any case.
+    """
+    try:
+        events = read_checked_events(game, journal_path)
+        return render_timeline(game, events, pipeline, size, fps, speed, painted)
+    finally:
+        pipeline.close()
+
+
+def read_checked_events(game, journal_path):
+    """The journal's events, once its header and every song it names match the game."""
+    check_header(game, read_header(journal_path), journal_path)
+    events = list(read_events(journal_path))
+    for record in events:
+        for song in record_songs(record):
+            if song not in game.original_order:
+                raise ValueError(f"{journal_path} names {song!r}, which is not in this song list")
+    return events
+
+
+def render_timeline(game, events, pipeline, size, fps, speed, painted):
+    timeline = []
+    t = 0.0
+    for i, record in enumerate(events):
+        if i:
+            t += min(record["t"] - events[i - 1]["t"], JournalReplayer.MAX_GAP) / speed
+        timeline.append((t, record))
+    # Let the last moves finish before the end.
+    duration = t + MOVE_DURATION / 1000 + 1.0
+
+    now = [0.0]
+    board = BoardRenderer(game, size, painted)
+    board.use_clock(lambda: now[0])
+    position = 0
+    frame = 0
+    try:
+        while frame / fps <= duration:
+            now[0] = frame / fps
+            while position < len(timeline) and timeline[position][0] <= now[0]:
+                apply_event(game, timeline[position][1])
+                position += 1
+            pipeline.submit(frame, board.render(now[0]), block=True)
+            frame += 1
+    finally:
+        board.close()
+    return frame
+
+
+def parse_size(text):
+    width, _, height = text.lower().partition("x")
+    return int(width), int(height)
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Pre-render a recorded contest offscreen")
+    parser.add_argument("journal", help="vote journal recorded with main.py --journal")
+    parser.add_argument("output", help='directory (PNG sequence), *.raw/*.bgra, a video file, or "-" for stdout')
+    parser.add_argument("--songs", default="songs.txt")
+    parser.add_argument("--players", default="players.txt")
+    parser.add_argument("--contest", help="compiled contest file, instead of --songs/--players")
+    parser.add_argument("--fps", type=int, default=DEFAULT_FPS)
+    parser.add_argument("--size", type=parse_size, default=DEFAULT_SIZE, help="WIDTHxHEIGHT")
+    parser.add_argument("--speed", type=float, default=1.0, help="contest time multiplier")
+    parser.add_argument("--widgets", action="store_true", help="render the widget board instead of the painted one")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv[:1])
+    game = create_game(args.contest) if args.contest else create_game(args.songs, args.players)
+    try:
+        # Before the sink opens (and ffmpeg starts) for a journal that cannot be rendered.
+        read_checked_events(game, args.journal)
+    except ValueError as error:
+        print(f"Error: {error}", file=sys.stderr)
+        return 1
+    pipeline = EncoderPipeline(open_sink(args.output, args.size, args.fps), workers=args.workers)
+    start = time.perf_counter()
+    frames = prerender(game, args.journal, pipeline, args.size, args.fps, args.speed, not args.widgets)
+    elapsed = time.perf_counter() - start
+    print(f"{frames} frames ({frames / args.fps:.1f} s of video) in {elapsed:.1f} s", file=sys.stderr)
+    del app
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,222 @@
+# catalog.py
+"""
+Song and player lists: a streaming text loader and a compiled contest format.
+
+Text lists (songs.txt, players.txt) are read one line at a time. Blank
+lines are skipped and duplicate entries are dropped (the first one wins)
+and reported, so two identical titles can no longer collide in the
+game's dicts.
+
+A compiled contest file holds the same lists as an interned string table
+plus integer IDs, followed by a hash index from title to song number:
+
+    header   MAGIC, string count, song count, player count, hash table size
+    uint32   string offsets (string count + 1) into the UTF-8 blob
+    uint32   string ID of every song, in original order
+    uint32   string ID of every player, in turn order
+    uint32   hash table: song number per slot (EMPTY if free), CRC32 + linear probing
+    bytes    UTF-8 blob of all strings
+
+Opening one maps the file read-only and reads the header, whatever the
+size of the contest; titles are decoded only when accessed. Several
+processes (or contests) opening the same file share its pages.
+
+    python catalog.py songs.txt players.txt contest.bin
+"""
+import mmap
+import struct
+import sys
+import zlib
+from array import array
+from collections.abc import Mapping, Sequence
+
+MAGIC = b"SCORECAT"
+HEADER = struct.Struct("<8sIIII")
+EMPTY = 0xFFFFFFFF
+
+
+def read_entries(path):
+    """Yields (line number, entry) for every non-blank line of a UTF-8 text file."""
+    with open(path, "r", encoding="utf-8-sig") as f:
+        for number, line in enumerate(f, 1):
+            entry = line.strip()
+            if entry:
+                yield number, entry
+
+
+def load_unique(path):
+    """
+    Returns (entries, collisions): the distinct entries of a text list in
+    file order, and {entry: [line numbers]} for every entry listed more
+    than once.
+    """
+    entries = []
+    first_line = {}
+    collisions = {}
+    for number, entry in read_entries(path):
+        if entry in first_line:
+            collisions.setdefault(entry, [first_line[entry]]).append(number)
+        else:
+            first_line[entry] = number
+            entries.append(entry)
+    return entries, collisions
+
+
+def is_compiled(path):
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def string_hash(data):
+    return zlib.crc32(data)
+
+
+# --- Writing ---
+def compile_contest(songs, players, path):
+    """Writes a compiled contest file for the given (distinct) songs and players."""
+    strings = []
+    string_ids = {}
+
+    def intern(text):
+        string_id = string_ids.get(text)
+        if string_id is None:
+            string_id = string_ids[text] = len(strings)
+            strings.append(text.encode("utf-8"))
+        return string_id
+
+    song_ids = array("I", (intern(song) for song in songs))
+    player_ids = array("I", (intern(player) for player in players))
+    if len(set(song_ids)) != len(song_ids):
+        raise ValueError("Song titles must be distinct")
+
+    offsets = array("I", [0])
+    for data in strings:
+        offsets.append(offsets[-1] + len(data))
+
+    table_size = 1
+    while table_size < 2 * len(song_ids):
+        table_size *= 2
+    table = array("I", [EMPTY]) * table_size
+    for number, string_id in enumerate(song_ids):
+        slot = string_hash(strings[string_id]) & (table_size - 1)
+        while table[slot] != EMPTY:
+            slot = (slot + 1) & (table_size - 1)
+        table[slot] = number
+
+    if sys.byteorder != "little":
+        for section in (offsets, song_ids, player_ids, table):
+            section.byteswap()
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, len(strings), len(song_ids), len(player_ids), table_size))
+        for section in (offsets, song_ids, player_ids, table):
+            section.tofile(f)
+        for data in strings:
+            f.write(data)
+
+
+def compile_text_lists(songs_file, players_file, path):
+    """Compiles songs.txt/players.txt; returns the collisions found in each list."""
+    songs, song_collisions = load_unique(songs_file)
+    players, player_collisions = load_unique(players_file)
+    compile_contest(songs, players, path)
+    return song_collisions, player_collisions
+
+
+# --- Reading ---
+class StringList(Sequence):
+    """Read-only list of strings, decoded from the string table on access."""
+    def __init__(self, catalog, ids):
+        self.catalog = catalog
+        self.ids = ids
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self.catalog.string(string_id) for string_id in self.ids[i]]
+        return self.catalog.string(self.ids[i])
+
+    def __iter__(self):
+        string = self.catalog.string
+        for string_id in self.ids:
+            yield string(string_id)
+
+
+class SongIndex(Mapping):
+    """Read-only {title: original index} mapping backed by the file's hash table."""
+    def __init__(self, catalog):
+        self.catalog = catalog
+
+    def __getitem__(self, title):
+        catalog = self.catalog
+        if not isinstance(title, str):
+            raise KeyError(title)
+        data = title.encode("utf-8")
+        mask = len(catalog.table) - 1
+        slot = string_hash(data) & mask
+        while True:
+            number = catalog.table[slot]
+            if number == EMPTY:
+                raise KeyError(title)
+            if catalog.raw_string(catalog.song_ids[number]) == data:
+                return number
+            slot = (slot + 1) & mask
+
+    def __iter__(self):
+        return iter(self.catalog.songs)
+
+    def __len__(self):
+        return len(self.catalog.song_ids)
+
+
+class Catalog:
+    """A compiled contest file mapped into memory (see compile_contest)."""
+    def __init__(self, path):
+        if sys.byteorder != "little":
+            raise RuntimeError("Compiled contests can only be opened on little-endian machines")
+        with open(path, "rb") as f:
+            self.buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, string_count, song_count, player_count, table_size = HEADER.unpack_from(self.buffer)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a compiled contest file")
+        view = memoryview(self.buffer)
+        position = HEADER.size
+
+        def section(count):
+            nonlocal position
+            words = view[position:position + 4 * count].cast("I")
+            position += 4 * count
+            return words
+        self.offsets = section(string_count + 1)
+        self.song_ids = section(song_count)
+        self.player_ids = section(player_count)
+        self.table = section(table_size)
+        self.blob = view[position:]
+        self.songs = StringList(self, self.song_ids)
+        self.players = StringList(self, self.player_ids)
+        self.song_index = SongIndex(self)
+
+    def raw_string(self, string_id):
+        return self.blob[self.offsets[string_id]:self.offsets[string_id + 1]]
+
+    def string(self, string_id):
+        return str(self.raw_string(string_id), "utf-8")
+
+
+def main(argv):
+    if len(argv) != 3:
+        print("usage: python catalog.py SONGS.txt PLAYERS.txt OUTPUT", file=sys.stderr)
+        return 2
+    song_collisions, player_collisions = compile_text_lists(*argv)
+    for kind, collisions in (("song", song_collisions), ("player", player_collisions)):
+        for entry, lines in collisions.items():
+            print(f"Duplicate {kind} {entry!r} on lines {lines}; kept the first", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,373 @@
+# fanout.py
+"""
+Spectator boards in separate processes, one per display.
+
+The presenter process runs a StatePublisher. It keeps the game's scores in
+a SharedScores file mapped into memory, and after every event loop pass
+that changed the game it sends each display the changed songs as one
+compact binary delta over a local socket. A display process mirrors the
+game from these deltas and renders its own board, so its repaints never
+hold up the presenter, and several displays render on several cores.
+
+    SharedScores file                 delta (one per flush)
+    header   STATE                    header   DELTA (seq, turn position, highlight, count)
+    int64    total score per song     entries  ENTRY (song index, total, current) * count
+    int64    current score per song
+
+The file is written under a sequence lock (seq is odd while a write is in
+progress), so any process can take a consistent snapshot of the scores
+from it without asking the publisher. A display connecting mid-contest
+takes such a snapshot, then applies the deltas that follow it.
+
+main.py --displays N starts N displays; one can also be started by hand:
+
+    python fanout.py SERVER_NAME --songs songs.txt --players players.txt --screen 1
+"""
+import argparse
+import mmap
+import os
+import struct
+import subprocess
+import sys
+import tempfile
+
+from PyQt5 import QtCore, QtNetwork, QtWidgets
+
+from game import create_game
+from presenter_window import game_info_text
+from spectator_window import SpectatorWindow
+
+try:
+    import numpy as np
+except ImportError:  # Without NumPy, scores are exposed as memoryviews.
+    np = None
+
+MAGIC = b"SCOREFAN"
+# magic, seq, song count, point index, player index, last voted song (-1: none), game over, padding
+STATE = struct.Struct("<8sQIIIiII")
+HELLO = struct.Struct("<8sIH")  # magic, song count, length of the scores path that follows
+DELTA = struct.Struct("<QIIiII")  # seq, point index, player index, last voted, game over, entry count
+ENTRY = struct.Struct("<Iqq")     # song index, total, current
+
+
+class SharedScores:
+    """
+    A game's scores in a memory-mapped file: STATE, then the total and
+    current score of every song as int64 in original order.
+    """
+    def __init__(self, path, songs=None):
+        """Creates the file for songs songs when songs is given, otherwise opens it read-only."""
+        self.path = path
+        if songs is not None:
+            with open(path, "w+b") as f:
+                f.truncate(STATE.size + 16 * songs)
+                self.buffer = mmap.mmap(f.fileno(), 0)
+            STATE.pack_into(self.buffer, 0, MAGIC, 0, songs, 0, 0, -1, 0, 0)
+        else:
+            with open(path, "rb") as f:
+                self.buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, _, self.songs, *_ = STATE.unpack_from(self.buffer)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a shared scores file")
+
+    def totals(self):
+        """Zero-copy view of the total scores (a NumPy array when available)."""
+        return self.view(STATE.size)
+
+    def currents(self):
+        """Zero-copy view of the current turn's scores."""
+        return self.view(STATE.size + 8 * self.songs)
+
+    def view(self, offset):
+        if np is not None:
+            return np.frombuffer(self.buffer, dtype=np.int64, count=self.songs, offset=offset)
+        return memoryview(self.buffer)[offset:offset + 8 * self.songs].cast("q")
+
+    def write(self, seq, scores, point_index, player_index, last_voted, game_over):
+        """Applies {song index: (total, current)} and the turn position as snapshot seq."""
+        totals, currents = self.totals(), self.currents()
+        struct.pack_into("<Q", self.buffer, 8, 2 * seq - 1)  # Odd: write in progress
+        for i, (total, current) in scores.items():
+            totals[i] = total
+            currents[i] = current
+        STATE.pack_into(self.buffer, 0, MAGIC, 2 * seq, self.songs, point_index, player_index,
+                        last_voted, int(game_over), 0)
+
+    def snapshot(self):
+        """A consistent copy: (seq, totals, currents, point index, player index, last voted, game over)."""
+        while True:
+            _, lock, _, point_index, player_index, last_voted, game_over, _ = STATE.unpack_from(self.buffer)
+            if lock % 2:
+                continue
+            totals, currents = list(self.totals()), list(self.currents())
+            if struct.unpack_from("<Q", self.buffer, 8)[0] == lock:
+                return lock // 2, totals, currents, point_index, player_index, last_voted, bool(game_over)
+
+    def close(self):
+        self.buffer.close()
+
+
+class StatePublisher(QtCore.QObject):
+    """
+    Publishes a game's state to display processes.
+
+    Game events only mark songs as changed; the changes are flushed once
+    per event loop pass, so a burst of ballots costs one delta. A display
+    that falls more than MAX_BACKLOG bytes behind is disconnected rather
+    than buffered without bound; it reconnects and catches up from the
+    shared scores.
+
+    The publisher can stand in for the SpectatorWindow of a PresenterWindow
+    (update_view, update_status, update_last_voted) when every board is
+    rendered by a display process.
+    """
+    MAX_BACKLOG = 4 * 1024 * 1024
+
+    def __init__(self, game, name=None, parent=None):
+        super().__init__(parent)
+        self.game = game
+        self.name = name or f"scoreboard-{os.getpid()}"
+        self.seq = 0
+        self.changed = set()   # Indices of songs changed since the last flush
+        self.turn = set()      # Indices of songs voted for in the current turn
+        self.last_voted = -1
+        self.flush_scheduled = False
+        self.processes = []
+        self.sockets = []
+        self.scores = SharedScores(os.path.join(tempfile.gettempdir(), self.name + ".scores"),
+                                   len(game.songs))
+        self.changed.update(range(len(game.songs)))
+        self.flush()
+        self.server = QtNetwork.QLocalServer(self)
+        QtNetwork.QLocalServer.removeServer(self.name)
+        self.server.newConnection.connect(self.on_new_connection)
+        if not self.server.listen(self.name):
+            raise RuntimeError(f"Cannot listen on {self.name}: {self.server.errorString()}")
+        game.add_listener(self.on_game_event)
+
+    def on_game_event(self, event, *args):
+        index_of = self.game.original_order
+        if event in ("assign", "ballot"):
+            entries = [args] if event == "assign" else args[0]
+            songs = {index_of[song] for song, _ in entries}
+            self.turn.update(songs)
+            self.changed.update(songs)
+            self.last_voted = index_of[self.game.highlighted_song(entries)]
+        elif event in ("finalize", "reset"):
+            self.changed.update(self.turn)
+            self.turn.clear()
+        elif event == "restore":
+            songs = range(len(self.game.songs)) if args[0] is None else {index_of[song] for song in args[0]}
+            self.changed.update(songs)
+            current = self.game.current_scores
+            self.turn = {i for i in self.turn.union(songs) if current[self.game.songs[i]]}
+            self.last_voted = -1
+        else:
+            return
+        self.schedule_flush()
+
+    def schedule_flush(self):
+        if not self.flush_scheduled:
+            self.flush_scheduled = True
+            QtCore.QTimer.singleShot(0, self.flush)
+
+    def flush(self):
+        """Writes the changed songs to the shared scores and sends them as one delta."""
+        self.flush_scheduled = False
+        game = self.game
+        if game.current_point_index == 0:
+            self.last_voted = -1
+        songs = game.songs
+        scores = {i: (game.total_scores[songs[i]], game.current_scores[songs[i]]) for i in sorted(self.changed)}
+        self.changed.clear()
+        self.seq += 1
+        self.scores.write(self.seq, scores, game.current_point_index, game.current_player_index,
+                          self.last_voted, game.game_over)
+        message = DELTA.pack(self.seq, game.current_point_index, game.current_player_index,
+                             self.last_voted, int(game.game_over), len(scores)) + b"".join(
+            ENTRY.pack(i, total, current) for i, (total, current) in scores.items()
+        )
+        for socket in self.sockets:
+            self.send(socket, message)
+
+    def send(self, socket, message):
+        if socket.bytesToWrite() > self.MAX_BACKLOG:
+            socket.abort()
+            return
+        socket.write(message)
+
+    def on_new_connection(self):
+        while self.server.hasPendingConnections():
+            socket = self.server.nextPendingConnection()
+            socket.disconnected.connect(lambda socket=socket: self.on_disconnected(socket))
+            path = self.scores.path.encode("utf-8")
+            socket.write(HELLO.pack(MAGIC, len(self.game.songs), len(path)) + path)
+            self.sockets.append(socket)
+
+    def on_disconnected(self, socket):
+        if socket in self.sockets:
+            self.sockets.remove(socket)
+        socket.deleteLater()
+
+    def display_count(self):
+        return len(self.sockets)
+
+    # --- SpectatorWindow stand-in ---
+    def update_view(self):
+        pass
+
+    def update_status(self, status_text):
+        pass  # Displays build the status line from their mirrored game.
+
+    def update_last_voted(self, song):
+        self.last_voted = self.game.original_order[song]
+        self.schedule_flush()
+
+    # --- Display processes ---
+    def spawn(self, arguments=(), screen=None):
+        """Starts a display process (see main below) with extra command line arguments."""
+        command = [sys.executable, os.path.abspath(__file__), self.name, *arguments]
+        if screen is not None:
+            command += ["--screen", str(screen)]
+        process = subprocess.Popen(command)
+        self.processes.append(process)
+        return process
+
+    def close(self):
+        for process in self.processes:
+            process.terminate()
+        for process in self.processes:
+            process.wait()
+        self.server.close()
+        self.scores.close()
+        try:
+            os.remove(self.scores.path)
+        except OSError:
+            pass
+
+
+class StateSubscriber(QtCore.QObject):
+    """
+    Mirrors a publisher's game into a local game and a SpectatorWindow.
+
+    Every delta is applied with Game.restore(), so the board re-ranks,
+    animates and highlights exactly as for local votes. The subscriber
+    reconnects (and catches up from the shared scores) whenever the
+    connection is lost, and emits lost() once the publisher has been
+    unreachable for MAX_RETRIES attempts in a row.
+    """
+    RECONNECT_INTERVAL = 1000  # ms
+    MAX_RETRIES = 5
+
+    lost = QtCore.pyqtSignal()
+
+    def __init__(self, game, window, name, parent=None):
+        super().__init__(parent)
+        self.game = game
+        self.window = window
+        self.name = name
+        self.seq = 0
+        self.buffer = b""
+        self.greeted = False
+        self.deltas = 0
+        self.retries = 0
+        self.socket = QtNetwork.QLocalSocket(self)
+        self.socket.readyRead.connect(self.on_ready_read)
+        self.socket.disconnected.connect(self.schedule_reconnect)
+        self.socket.errorOccurred.connect(self.schedule_reconnect)
+        self.reconnect_timer = QtCore.QTimer(self)
+        self.reconnect_timer.setSingleShot(True)
+        self.reconnect_timer.timeout.connect(self.connect_to_publisher)
+
+    def connect_to_publisher(self):
+        self.buffer = b""
+        self.greeted = False
+        self.socket.abort()
+        self.socket.connectToServer(self.name)
+
+    def schedule_reconnect(self, *args):
+        if self.reconnect_timer.isActive():
+            return
+        self.retries += 1
+        if self.retries > self.MAX_RETRIES:
+            self.lost.emit()
+        else:
+            self.reconnect_timer.start(self.RECONNECT_INTERVAL)
+
+    def on_ready_read(self):
+        self.buffer += bytes(self.socket.readAll())
+        position = 0
+        buffer = self.buffer
+        if not self.greeted:
+            if len(buffer) < HELLO.size:
+                return
+            magic, songs, length = HELLO.unpack_from(buffer)
+            if len(buffer) < HELLO.size + length:
+                return
+            if magic != MAGIC or songs != len(self.game.songs):
+                raise ValueError("The publisher's contest does not match this display's song list")
+            self.synchronize(buffer[HELLO.size:HELLO.size + length].decode("utf-8"))
+            position = HELLO.size + length
+            self.greeted = True
+            self.retries = 0
+        while len(buffer) - position >= DELTA.size:
+            header = DELTA.unpack_from(buffer, position)
+            end = position + DELTA.size + header[-1] * ENTRY.size
+            if len(buffer) < end:
+                break
+            if header[0] > self.seq:
+                self.apply(header, ENTRY.iter_unpack(buffer[position + DELTA.size:end]))
+            position = end
+        self.buffer = buffer[position:]
+
+    def synchronize(self, path):
+        """Catches up from a snapshot of the publisher's shared scores."""
+        scores = SharedScores(path)
+        seq, totals, currents, point_index, player_index, last_voted, game_over = scores.snapshot()
+        scores.close()
+        self.apply((seq, point_index, player_index, last_voted, game_over, len(totals)),
+                   ((i, total, current) for i, (total, current) in enumerate(zip(totals, currents))))
+
+    def apply(self, header, entries):
+        seq, point_index, player_index, last_voted, game_over, _ = header
+        self.seq = seq
+        songs = self.game.songs
+        self.game.restore({songs[i]: (total, current) for i, total, current in entries},
+                          point_index, player_index, bool(game_over))
+        if last_voted >= 0:
+            self.window.update_last_voted(songs[last_voted])
+        else:
+            self.window.update_view()
+        self.window.update_status(game_info_text(self.game))
+        self.deltas += 1
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Spectator display fed by a presenter process")
+    parser.add_argument("server", help="name of the publisher's local server")
+    parser.add_argument("--songs", default="songs.txt")
+    parser.add_argument("--players", default="players.txt")
+    parser.add_argument("--contest", help="compiled contest file, instead of --songs/--players")
+    parser.add_argument("--painted", action="store_true")
+    parser.add_argument("--reduced-motion", action="store_true")
+    parser.add_argument("--screen", type=int, help="show the board full screen on this screen")
+    app = QtWidgets.QApplication(sys.argv[:1])
+    args = parser.parse_args(argv)
+
+    game = create_game(args.contest) if args.contest else create_game(args.songs, args.players)
+    window = SpectatorWindow(game, painted=args.painted)
+    window.set_reduced_motion(args.reduced_motion)
+    subscriber = StateSubscriber(game, window, args.server)
+    subscriber.lost.connect(app.quit)
+    subscriber.connect_to_publisher()
+    screens = app.screens()
+    if args.screen is not None and args.screen < len(screens):
+        window.setGeometry(screens[args.screen].geometry())
+        window.showFullScreen()
+    else:
+        window.show()
+    return app.exec_()
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
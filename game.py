@@ -1,7 +1,21 @@
 import os
 
+from catalog import Catalog, is_compiled, load_unique
+from perf import timed
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; only ArrayGame needs it.
+    np = None
+
+
 class Game:
-    def __init__(self, songs_file, players_file):
+    def __init__(self, songs_file, players_file=None):
+        """
+        songs_file and players_file are text lists with one entry per line.
+        songs_file may instead be a compiled contest file (see catalog.py),
+        which also holds the players and opens without parsing anything.
+        """
         self.songs = []            # List of songs
         self.players = []          # List of players
         self.total_scores = {}     # Total score for each song
@@ -11,37 +25,68 @@ class Game:
         self.current_player_index = 0        # Index of the current player
         self.original_order = {}             # Original order of songs (song: index)
         self.game_over = False               # Flag to end the game after the last player
+        self.listeners = []                  # Callbacks notified of every state change
+        self.song_collisions = {}            # Duplicate songs dropped while loading (song: line numbers)
+        self.player_collisions = {}          # Duplicate players dropped while loading
+        self.catalog = None                  # Compiled contest file, if loaded from one
+        self.pending_ballots = {}            # Ballots collected ahead of their turn (player: ballot)
 
-        self.load_songs(songs_file)
-        self.load_players(players_file)
+        if is_compiled(songs_file):
+            self.load_catalog(songs_file)
+        else:
+            self.load_songs(songs_file)
+            self.load_players(players_file)
+            # Store original order
+            for index, song in enumerate(self.songs):
+                self.original_order[song] = index
+        self.init_scores()
 
-        # Initialize scores and store original order
-        for index, song in enumerate(self.songs):
+    def init_scores(self):
+        for song in self.songs:
             self.total_scores[song] = 0
             self.current_scores[song] = 0
-            self.original_order[song] = index
 
     def load_songs(self, songs_file):
-        if os.path.exists(songs_file):
-            with open(songs_file, "r", encoding="utf-8") as f:
-                lines = f.readlines()
-            self.songs = [line.strip() for line in lines if line.strip()]
+        if songs_file and os.path.exists(songs_file):
+            self.songs, self.song_collisions = load_unique(songs_file)
         else:
             self.songs = []
 
     def load_players(self, players_file):
-        if os.path.exists(players_file):
-            with open(players_file, "r", encoding="utf-8") as f:
-                lines = f.readlines()
-            self.players = [line.strip() for line in lines if line.strip()]
+        if players_file and os.path.exists(players_file):
+            self.players, self.player_collisions = load_unique(players_file)
         else:
             self.players = []
 
+    def load_catalog(self, path):
+        """Uses the songs and players of a compiled contest file; titles are decoded lazily."""
+        self.catalog = Catalog(path)
+        self.songs = self.catalog.songs
+        self.players = list(self.catalog.players)
+        self.original_order = self.catalog.song_index
+
+    def add_listener(self, callback):
+        """Registers callback(event, *args), called after every state change:
+        ("assign", song, points), ("ballot", ballot), ("finalize",), ("reset",),
+        ("restore", songs), where songs lists the songs whose scores were
+        restored or is None when every song may have changed, and
+        ("pending", player) when a collected ballot is submitted or withdrawn.
+        """
+        self.listeners.append(callback)
+
+    def remove_listener(self, callback):
+        self.listeners.remove(callback)
+
+    def notify(self, event, *args):
+        for callback in self.listeners:
+            callback(event, *args)
+
     def get_current_player(self):
         if self.players:
             return self.players[self.current_player_index]
         return None
 
+    @timed("Game.assign_point")
     def assign_point(self, song_name):
         """Assigns the next point in the sequence to the chosen song."""
         if self.game_over:
@@ -50,33 +95,296 @@ class Game:
             points = self.points_sequence[self.current_point_index]
             self.current_scores[song_name] += points
             self.current_point_index += 1
+            self.notify("assign", song_name, points)
             return points
         else:
             return None
 
+    def validate_ballot(self, player, ballot):
+        """Checks a juror ballot [(song, points), ...] against the current turn.
+
+        The ballot must come from the current player, name known songs and use
+        exactly the next values of points_sequence (in any order). Returns the
+        ballot reordered to follow points_sequence; raises ValueError otherwise.
+        """
+        if player != self.get_current_player():
+            raise ValueError(f"{player!r} is not the current player")
+        ballot = list(ballot)
+        start = self.current_point_index
+        expected = self.points_sequence[start:start + len(ballot)]
+        if len(expected) < len(ballot):
+            raise ValueError("Ballot has more entries than points left in this turn")
+        if sorted(points for _, points in ballot) != sorted(expected):
+            raise ValueError(f"Ballot points must be {expected}")
+        for song, _ in ballot:
+            if song not in self.original_order:
+                raise ValueError(f"Unknown song {song!r}")
+        return self.order_ballot(ballot, expected)
+
+    @staticmethod
+    def order_ballot(ballot, expected):
+        """Reorders a ballot so that the points are applied in sequence order."""
+        pending = list(ballot)
+        ordered = []
+        for points in expected:
+            for i, (song, value) in enumerate(pending):
+                if value == points:
+                    ordered.append((song, points))
+                    del pending[i]
+                    break
+        return ordered
+
+    def assign_points_batch(self, player, ballot):
+        """Applies a whole juror ballot [(song, points), ...] in one call.
+
+        Equivalent to calling assign_point once per entry in sequence order,
+        so is_turn_complete() behaves exactly as with single clicks.
+        Returns the list of assigned points, or None if the game is over.
+        """
+        if self.game_over:
+            return None
+        ballot = self.validate_ballot(player, ballot)
+        self.apply_ballot(ballot)
+        self.current_point_index += len(ballot)
+        self.notify("ballot", ballot)
+        return [points for _, points in ballot]
+
+    def apply_ballot(self, ballot):
+        for song, points in ballot:
+            self.current_scores[song] += points
+
+    @staticmethod
+    def highlighted_song(ballot):
+        """The song the boards highlight after a vote [(song, points), ...]: the one that got the most points."""
+        return max(ballot, key=lambda entry: entry[1])[0]
+
+    def submit_ballot(self, player, ballot):
+        """Collects a juror's whole ballot [(song, points), ...] ahead of their turn.
+
+        Jurors and sub-juries may vote at the same time: every collected
+        ballot is kept apart from the others and from the scores until
+        reveal_next() applies it, always in player order whatever the order
+        of submission. The ballot must use exactly the values of
+        points_sequence and name known songs; it replaces an earlier ballot
+        of the same player. Raises ValueError otherwise.
+        """
+        if self.game_over:
+            raise ValueError("The game is over")
+        if player not in self.players:
+            raise ValueError(f"Unknown player {player!r}")
+        if self.players.index(player) < self.current_player_index:
+            raise ValueError(f"{player!r} has already voted")
+        ballot = list(ballot)
+        if sorted(points for _, points in ballot) != sorted(self.points_sequence):
+            raise ValueError(f"Ballot points must be {self.points_sequence}")
+        for song, _ in ballot:
+            if song not in self.original_order:
+                raise ValueError(f"Unknown song {song!r}")
+        self.pending_ballots[player] = self.order_ballot(ballot, self.points_sequence)
+        self.notify("pending", player)
+
+    def withdraw_ballot(self, player):
+        if self.pending_ballots.pop(player, None) is not None:
+            self.notify("pending", player)
+
+    def next_pending_ballot(self):
+        """The current player's collected ballot, if any and if their turn has not been started by hand."""
+        if self.game_over or self.current_point_index != 0:
+            return None
+        return self.pending_ballots.get(self.get_current_player())
+
+    def reveal_next(self):
+        """
+        Applies the current player's collected ballot as their turn (as
+        assign_points_batch does) and returns it, or returns None if there
+        is none to reveal. The turn is left complete for finalize_turn().
+        """
+        ballot = self.next_pending_ballot()
+        if ballot is None:
+            return None
+        player = self.get_current_player()
+        self.withdraw_ballot(player)
+        self.assign_points_batch(player, ballot)
+        return ballot
+
     def is_turn_complete(self):
         """Checks if all points have been distributed for the current turn."""
         return self.current_point_index >= len(self.points_sequence)
 
+    @timed("Game.finalize_turn")
     def finalize_turn(self):
         """Transfers the current turn's scores to total scores, resets the turn,
            and advances to the next player. (Note: The presenter’s song order is not changed.)
         """
         if self.game_over:
             return
-        for song in self.songs:
-            self.total_scores[song] += self.current_scores[song]
-            self.current_scores[song] = 0
+        # A ballot collected for this turn is no longer needed if the turn was played by hand.
+        self.withdraw_ballot(self.get_current_player())
+        self.merge_current_scores()
         self.current_point_index = 0
         if self.current_player_index == len(self.players) - 1:
             self.game_over = True
         else:
             self.current_player_index += 1
+        self.notify("finalize")
+
+    def merge_current_scores(self):
+        for song in self.songs:
+            self.total_scores[song] += self.current_scores[song]
+            self.current_scores[song] = 0
 
     def reset_turn(self):
         """Resets the current turn's scores without transferring them to total scores."""
         if self.game_over:
             return
+        self.clear_current_scores()
+        self.current_point_index = 0
+        self.notify("reset")
+
+    def clear_current_scores(self):
         for song in self.songs:
             self.current_scores[song] = 0
-        self.current_point_index = 0
\ No newline at end of file
+
+    def get_state(self):
+        """Returns the scoring state as plain data (scores listed in song order)."""
+        return {
+            "total": [self.total_scores[song] for song in self.songs],
+            "current": [self.current_scores[song] for song in self.songs],
+            "current_point_index": self.current_point_index,
+            "current_player_index": self.current_player_index,
+            "game_over": self.game_over,
+            "pending": {player: [[song, points] for song, points in ballot]
+                        for player, ballot in self.pending_ballots.items()},
+        }
+
+    def set_state(self, state):
+        """Restores a state returned by get_state() and notifies listeners with ("restore", None)."""
+        if len(state["total"]) != len(self.songs):
+            raise ValueError("State does not match the song list")
+        self.load_scores(state["total"], state["current"])
+        self.current_point_index = state["current_point_index"]
+        self.current_player_index = state["current_player_index"]
+        self.game_over = state["game_over"]
+        self.pending_ballots = {player: [tuple(entry) for entry in ballot]
+                                for player, ballot in state.get("pending", {}).items()}
+        self.notify("restore", None)
+
+    def restore(self, scores, current_point_index, current_player_index, game_over, pending=None):
+        """
+        Sets the scores of some songs, {song: (total, current)}, and the turn
+        position, then notifies listeners with ("restore", songs). Used to
+        move through a GameHistory without touching the other songs.
+
+        pending, {player: ballot or None}, puts collected ballots back (or
+        withdraws them), each notified with ("pending", player) afterwards.
+        """
+        for song, (total, current) in scores.items():
+            self.total_scores[song] = total
+            self.current_scores[song] = current
+        self.current_point_index = current_point_index
+        self.current_player_index = current_player_index
+        self.game_over = game_over
+        changed = []
+        for player, ballot in (pending or {}).items():
+            if ballot is not None:
+                self.pending_ballots[player] = ballot
+                changed.append(player)
+            elif self.pending_ballots.pop(player, None) is not None:
+                changed.append(player)
+        self.notify("restore", list(scores))
+        for player in changed:
+            self.notify("pending", player)
+
+    def load_scores(self, total, current):
+        for song, song_total, song_current in zip(self.songs, total, current):
+            self.total_scores[song] = song_total
+            self.current_scores[song] = song_current
+
+
+class ScoreView:
+    """Dict-like view of a score vector, keyed by song title.
+
+    Lets code written against Game.total_scores / Game.current_scores
+    (the presenter and spectator windows) read and write an ArrayGame's
+    NumPy vectors without knowing about song IDs.
+    """
+    def __init__(self, vector, song_ids):
+        self._vector = vector
+        self._song_ids = song_ids
+
+    def __getitem__(self, song):
+        return int(self._vector[self._song_ids[song]])
+
+    def __setitem__(self, song, value):
+        self._vector[self._song_ids[song]] = value
+
+    def __contains__(self, song):
+        return song in self._song_ids
+
+    def __iter__(self):
+        return iter(self._song_ids)
+
+    def __len__(self):
+        return len(self._song_ids)
+
+    def get(self, song, default=None):
+        if song in self._song_ids:
+            return self[song]
+        return default
+
+    def keys(self):
+        return self._song_ids.keys()
+
+    def values(self):
+        return [self[song] for song in self._song_ids]
+
+    def items(self):
+        return [(song, self[song]) for song in self._song_ids]
+
+
+class ArrayGame(Game):
+    """Game with an array-backed scoring core.
+
+    Songs get integer IDs (their original index) and scores live in two
+    contiguous NumPy vectors, so finalize_turn/reset_turn are single vector
+    operations and a whole ballot is applied with one scatter-add.
+    total_scores and current_scores remain available as dict-like views.
+    """
+    def init_scores(self):
+        if np is None:
+            raise RuntimeError("ArrayGame requires NumPy")
+        # A song's ID is its index in self.songs, so the vectors are in song order.
+        self.song_ids = self.original_order
+        self.total_vector = np.zeros(len(self.songs), dtype=np.int64)
+        self.current_vector = np.zeros(len(self.songs), dtype=np.int64)
+        self.total_scores = ScoreView(self.total_vector, self.song_ids)
+        self.current_scores = ScoreView(self.current_vector, self.song_ids)
+
+    def apply_ballot(self, ballot):
+        ids = [self.song_ids[song] for song, _ in ballot]
+        points = [points for _, points in ballot]
+        np.add.at(self.current_vector, ids, points)
+
+    def merge_current_scores(self):
+        self.total_vector += self.current_vector
+        self.current_vector.fill(0)
+
+    def clear_current_scores(self):
+        self.current_vector.fill(0)
+
+    def get_state(self):
+        state = super().get_state()
+        state["total"] = self.total_vector.tolist()
+        state["current"] = self.current_vector.tolist()
+        return state
+
+    def load_scores(self, total, current):
+        self.total_vector[:] = total
+        self.current_vector[:] = current
+
+
+def create_game(songs_file, players_file=None):
+    """Returns an ArrayGame when NumPy is installed, a plain Game otherwise."""
+    if np is not None:
+        return ArrayGame(songs_file, players_file)
+    return Game(songs_file, players_file)
@@ -0,0 +1,257 @@
+# history.py
+"""
+Undo, redo and timeline seeking over a game's scoring state.
+
+GameHistory records a Snapshot after every assign, ballot, finalize,
+reset and outside restore. The snapshots are immutable and share
+structure: scores are kept in ScoreVectors, persistent vectors cut into
+fixed-size chunks, and an update copies only the chunks it touches.
+Recording a vote therefore costs one chunk plus the list of chunk
+references, whatever the number of songs. Moving to another snapshot
+(undo, redo, seek) compares the two vectors chunk by chunk, skips the
+chunks they share and writes only the songs that differ back into the
+game with Game.restore().
+
+Collected ballots (see Game.submit_ballot) come and go outside the
+timeline and are not snapshotted. A snapshot only keeps the ballots its
+event withdrew (a revealed ballot, or one dropped by a turn played by
+hand): moving back before it puts them back with the game's other
+collected ballots, moving forward past it withdraws them again.
+"""
+
+
+class ScoreVector:
+    """Immutable vector of ints, stored as a tuple of CHUNK-sized tuples."""
+    CHUNK = 64
+
+    __slots__ = ("chunks", "length")
+
+    def __init__(self, chunks, length):
+        self.chunks = chunks
+        self.length = length
+
+    @classmethod
+    def from_values(cls, values):
+        values = tuple(values)
+        size = cls.CHUNK
+        return cls(tuple(values[i:i + size] for i in range(0, len(values), size)), len(values))
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, i):
+        return self.chunks[i // self.CHUNK][i % self.CHUNK]
+
+    def __iter__(self):
+        for chunk in self.chunks:
+            yield from chunk
+
+    def set(self, updates):
+        """A new vector with {index: value} applied; untouched chunks are shared."""
+        if not updates:
+            return self
+        by_chunk = {}
+        for i, value in updates.items():
+            by_chunk.setdefault(i // self.CHUNK, []).append((i % self.CHUNK, value))
+        chunks = list(self.chunks)
+        for c, entries in by_chunk.items():
+            chunk = list(chunks[c])
+            for offset, value in entries:
+                chunk[offset] = value
+            chunks[c] = tuple(chunk)
+        return ScoreVector(tuple(chunks), self.length)
+
+    def diff(self, other):
+        """Indices whose value differs in other (a vector of the same length)."""
+        size = self.CHUNK
+        changed = []
+        for c, (mine, theirs) in enumerate(zip(self.chunks, other.chunks)):
+            if mine is theirs:
+                continue
+            base = c * size
+            changed.extend(base + offset for offset, (a, b) in enumerate(zip(mine, theirs)) if a != b)
+        return changed
+
+
+class Snapshot:
+    """The scoring state of a game after one event."""
+    __slots__ = ("total", "current", "point_index", "player_index", "game_over", "turn", "label", "withdrawn")
+
+    def __init__(self, total, current, point_index, player_index, game_over, turn, label, withdrawn=()):
+        self.total = total                # ScoreVector, by original song index
+        self.current = current            # ScoreVector, by original song index
+        self.point_index = point_index
+        self.player_index = player_index
+        self.game_over = game_over
+        self.turn = turn                  # frozenset of song indices voted for in this turn
+        self.label = label                # What led to this state, for the timeline
+        self.withdrawn = withdrawn        # (player, ballot) of the collected ballots this event used up
+
+
+class GameHistory:
+    """
+    Linear history of a game's states with undo/redo and seeking.
+
+    A move between two snapshots compares their vectors chunk by chunk,
+    O(songs / CHUNK) with shared chunks skipped by identity, then restores
+    the songs that differ.
+
+    Recording starts from the game's state when the history is created.
+    undo(), redo() and seek(position) move through the recorded snapshots
+    and restore the game to the one selected; a new event recorded while
+    not at the end drops the snapshots after the current position, as in
+    an editor. Listeners are notified of moves with ("restore", songs).
+    """
+    def __init__(self, game, limit=None):
+        """limit caps the number of snapshots kept (the oldest are forgotten)."""
+        self.game = game
+        self.limit = limit
+        self.index_of = game.original_order
+        self.restoring = False
+        self.pending = dict(game.pending_ballots)  # Collected ballots, to know what a withdrawal took
+        self.withdrawn = []                        # Ballots withdrawn since the last snapshot
+        self.snapshots = [self.capture("Start")]
+        self.position = 0
+        game.add_listener(self.on_game_event)
+
+    def close(self):
+        self.game.remove_listener(self.on_game_event)
+
+    # --- Recording ---
+    def capture(self, label):
+        """A full snapshot of the game (O(songs)); used at start and after outside restores."""
+        game = self.game
+        total = ScoreVector.from_values(game.total_scores[song] for song in game.songs)
+        current = ScoreVector.from_values(game.current_scores[song] for song in game.songs)
+        turn = frozenset(i for i, points in enumerate(current) if points)
+        return Snapshot(total, current, game.current_point_index, game.current_player_index,
+                        game.game_over, turn, label, self.take_withdrawn())
+
+    def on_game_event(self, event, *args):
+        if self.restoring:
+            return
+        game = self.game
+        last = self.snapshots[self.position]
+        player = self.player_name(last.player_index)
+        if event == "pending":
+            self.track_pending(args[0])
+            return
+        if event in ("assign", "ballot"):
+            entries = [args] if event == "assign" else args[0]
+            songs = {self.index_of[song] for song, _ in entries}
+            current = last.current.set({i: game.current_scores[game.songs[i]] for i in songs})
+            if event == "assign":
+                label = f"{player}: {args[1]} → {args[0]}"
+            else:
+                label = f"{player}: ballot"
+            snapshot = self.derive(last.total, current, last.turn | songs, label)
+        elif event == "finalize":
+            total = last.total.set({i: game.total_scores[game.songs[i]] for i in last.turn})
+            current = last.current.set({i: 0 for i in last.turn})
+            snapshot = self.derive(total, current, frozenset(), f"{player}: turn finalized")
+        elif event == "reset":
+            current = last.current.set({i: 0 for i in last.turn})
+            snapshot = self.derive(last.total, current, frozenset(), f"{player}: turn reset")
+        elif event == "restore":
+            if args[0] is None:
+                self.pending = dict(game.pending_ballots)
+                snapshot = self.capture("Restored")
+            else:
+                songs = {self.index_of[song] for song in args[0]}
+                total = last.total.set({i: game.total_scores[game.songs[i]] for i in songs})
+                current = last.current.set({i: game.current_scores[game.songs[i]] for i in songs})
+                turn = frozenset(i for i in last.turn | songs if current[i])
+                snapshot = self.derive(total, current, turn, "Restored")
+        else:
+            return
+        self.record(snapshot)
+
+    def derive(self, total, current, turn, label):
+        game = self.game
+        return Snapshot(total, current, game.current_point_index, game.current_player_index,
+                        game.game_over, turn, label, self.take_withdrawn())
+
+    def track_pending(self, player):
+        ballot = self.game.pending_ballots.get(player)
+        if ballot is not None:
+            self.pending[player] = ballot
+        elif player in self.pending:
+            self.withdrawn.append((player, self.pending.pop(player)))
+
+    def take_withdrawn(self):
+        withdrawn, self.withdrawn = tuple(self.withdrawn), []
+        return withdrawn
+
+    def record(self, snapshot):
+        del self.snapshots[self.position + 1:]
+        self.snapshots.append(snapshot)
+        if self.limit is not None and len(self.snapshots) > self.limit:
+            del self.snapshots[0]
+        self.position = len(self.snapshots) - 1
+
+    def player_name(self, index):
+        players = self.game.players
+        return players[index] if index < len(players) else "N/A"
+
+    # --- Navigation ---
+    def __len__(self):
+        return len(self.snapshots)
+
+    def label(self, position):
+        return self.snapshots[position].label
+
+    def can_undo(self):
+        return self.position > 0
+
+    def can_redo(self):
+        return self.position < len(self.snapshots) - 1
+
+    def undo(self):
+        if self.can_undo():
+            self.seek(self.position - 1)
+
+    def redo(self):
+        if self.can_redo():
+            self.seek(self.position + 1)
+
+    def seek(self, position):
+        """
+        Restores the game to the snapshot at position (negative counts from
+        the end). Costs O(songs / CHUNK) chunk comparisons, one write per song
+        that differs and a pass over the snapshots in between for the
+        collected ballots they withdrew.
+        """
+        if position < 0:
+            position += len(self.snapshots)
+        if not 0 <= position < len(self.snapshots):
+            raise IndexError(f"No snapshot at position {position}")
+        source_position = self.position
+        source = self.snapshots[source_position]
+        target = self.snapshots[position]
+        self.position = position
+        songs = self.game.songs
+        changed = set(source.total.diff(target.total))
+        changed.update(source.current.diff(target.current))
+        scores = {songs[i]: (target.total[i], target.current[i]) for i in sorted(changed)}
+        self.restoring = True
+        try:
+            self.game.restore(scores, target.point_index, target.player_index, target.game_over,
+                              self.pending_changes(source_position, position))
+        finally:
+            self.restoring = False
+        self.pending = dict(self.game.pending_ballots)
+        self.withdrawn = []
+
+    def pending_changes(self, source, target):
+        """Collected ballots to put back ({player: ballot}) or withdraw ({player: None}) from source to target."""
+        pending = {}
+        if target < source:
+            # The earliest withdrawal is the ballot that was collected at target.
+            for snapshot in reversed(self.snapshots[target + 1:source + 1]):
+                pending.update(snapshot.withdrawn)
+            # A ballot collected again since then is the newer one.
+            return {player: ballot for player, ballot in pending.items()
+                    if player not in self.game.pending_ballots}
+        for snapshot in self.snapshots[source + 1:target + 1]:
+            pending.update((player, None) for player, _ in snapshot.withdrawn)
+        return pending
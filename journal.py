@@ -0,0 +1,299 @@
+# journal.py
+import json
+import os
+import time
+
+from PyQt5 import QtCore
+
+
+class VoteJournal:
+    """
+    Append-only journal of every Game event, for crash recovery and replays.
+
+    Each game event (see Game.add_listener) is appended as one JSON line and
+    flushed to the OS immediately, so a crash of the app loses nothing. The
+    (slower) fsync that protects against power loss is batched: it runs every
+    SYNC_EVERY events, at every finalized turn, and at the latest SYNC_INTERVAL
+    seconds after an unsynced write, even if no other event follows it.
+
+    Every SNAPSHOT_EVERY events a compact snapshot of the game state is
+    written next to the journal (path + ".snapshot") together with the journal
+    offset it covers, so recovery only replays the journal tail. A snapshot
+    that does not match the journal (left over from another contest, or
+    covering lines the journal no longer has) is ignored.
+    """
+    SYNC_EVERY = 32       # Events between two fsyncs
+    SYNC_INTERVAL = 0.5   # Max seconds an event may stay un-fsynced
+    SNAPSHOT_EVERY = 200  # Events between two snapshots
+
+    def __init__(self, game, path):
+        """Opens (or creates) the journal at path, restoring game from it if it exists.
+        Call this before any vote is cast and before the windows are created."""
+        self.game = game
+        self.path = path
+        self.snapshot_path = path + ".snapshot"
+        self.seq = 0
+        self.unsynced = 0
+        self.last_sync = time.monotonic()
+        # Syncs the last writes when no further event comes to trigger it.
+        self.sync_timer = QtCore.QTimer()
+        self.sync_timer.setSingleShot(True)
+        self.sync_timer.setInterval(int(self.SYNC_INTERVAL * 1000))
+        self.sync_timer.timeout.connect(self.sync)
+        self.started = None  # Time of the journal's start record, recorded in snapshots
+        self.events_since_snapshot = 0
+        self.recovered_events = 0
+
+        offset = 0
+        if os.path.exists(path):
+            offset = self.recover()
+        self.file = open(path, "a+b")
+        # Drop a torn last line left by a crash in the middle of a write.
+        self.file.truncate(offset)
+        if offset == 0:
+            header = {"event": "start", "songs": len(game.songs), "players": len(game.players)}
+            self.write(header)
+            self.started = header["t"]
+            self.sync()
+        game.add_listener(self.on_game_event)
+
+    # --- Writing ---
+    def write(self, record):
+        record["seq"] = self.seq
+        record["t"] = time.time()
+        self.seq += 1
+        self.file.write(json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n")
+        self.file.flush()
+        self.unsynced += 1
+        if not self.sync_timer.isActive():
+            self.sync_timer.start()
+
+    def sync(self):
+        self.sync_timer.stop()
+        if self.unsynced:
+            os.fsync(self.file.fileno())
+            self.unsynced = 0
+        self.last_sync = time.monotonic()
+
+    def on_game_event(self, event, *args):
+        if event == "assign":
+            self.write({"event": "assign", "song": args[0], "points": args[1]})
+        elif event == "ballot":
+            self.write({"event": "ballot", "player": self.game.get_current_player(),
+                        "ballot": [[song, points] for song, points in args[0]]})
+        elif event in ("finalize", "reset"):
+            self.write({"event": event})
+        elif event == "restore":
+            self.write(restore_record(self.game, args[0]))
+        elif event == "pending":
+            ballot = self.game.pending_ballots.get(args[0])
+            if ballot is None:
+                self.write({"event": "withdraw", "player": args[0]})
+            else:
+                self.write({"event": "submit", "player": args[0],
+                            "ballot": [[song, points] for song, points in ballot]})
+        else:
+            return
+        if (event == "finalize" or self.unsynced >= self.SYNC_EVERY
+                or time.monotonic() - self.last_sync >= self.SYNC_INTERVAL):
+            self.sync()
+        self.events_since_snapshot += 1
+        if self.events_since_snapshot >= self.SNAPSHOT_EVERY:
+            self.write_snapshot()
+
+    def write_snapshot(self):
+        """Atomically replaces the snapshot with the current state and journal offset."""
+        self.sync()
+        snapshot = {"seq": self.seq, "offset": self.file.tell(), "start": self.started,
+                    "state": self.game.get_state()}
+        tmp_path = self.snapshot_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+        self.events_since_snapshot = 0
+
+    def close(self):
+        self.sync()
+        self.file.close()
+
+    # --- Recovery ---
+    def recover(self):
+        """Restores the game from the snapshot plus the journal tail.
+        Returns the offset just past the last complete journal line."""
+        with open(self.path, "rb") as f:
+            header = f.readline()
+            self.check_header(json.loads(header))
+            offset = len(header)
+            snapshot = self.read_snapshot(f)
+            if snapshot is not None:
+                self.game.set_state(snapshot["state"])
+                offset, self.seq = snapshot["offset"], snapshot["seq"]
+            f.seek(offset)
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break  # Torn write at the end of the journal.
+                if not line.endswith(b"\n"):
+                    break
+                apply_event(self.game, record)
+                offset += len(line)
+                self.seq = record["seq"] + 1
+                self.recovered_events += 1
+        return offset
+
+    def check_header(self, header):
+        check_header(self.game, header, self.path)
+        self.seq = header["seq"] + 1
+        self.started = header["t"]
+
+    def read_snapshot(self, f):
+        """
+        The snapshot if it belongs to the journal open as f and its offset
+        falls on a line boundary the journal still has (with the expected
+        record there); None otherwise, and recovery replays the whole
+        journal rather than cutting off valid lines.
+        """
+        if not os.path.exists(self.snapshot_path):
+            return None
+        try:
+            with open(self.snapshot_path, "r", encoding="utf-8") as snapshot_file:
+                snapshot = json.load(snapshot_file)
+            offset, seq = snapshot["offset"], snapshot["seq"]
+        except (ValueError, KeyError, TypeError):
+            return None
+        if snapshot.get("start") != self.started:
+            return None
+        size = os.fstat(f.fileno()).st_size
+        if not f.tell() <= offset <= size:
+            return None
+        f.seek(offset - 1)
+        if f.read(1) != b"\n":
+            return None
+        line = f.readline()
+        if line.endswith(b"\n"):
+            try:
+                if json.loads(line).get("seq") != seq:
+                    return None
+            except ValueError:
+                return None
+        return snapshot
+
+
+def check_header(game, header, path):
+    """Raises ValueError unless header is the start record of a journal written for game's song list."""
+    if header.get("event") != "start" or header.get("songs") != len(game.songs):
+        raise ValueError(f"{path} was not written for this song list")
+
+
+def read_header(path):
+    """The start record of a journal."""
+    with open(path, "rb") as f:
+        try:
+            return json.loads(f.readline())
+        except ValueError:
+            raise ValueError(f"{path} is not a vote journal") from None
+
+
+def record_songs(record):
+    """The songs a journal record names."""
+    if "song" in record:
+        return [record["song"]]
+    if "ballot" in record:
+        return [song for song, _ in record["ballot"]]
+    if "scores" in record:
+        return [song for song, _, _ in record["scores"]]
+    return []
+
+
+def read_events(path):
+    """Yields the recorded game events of a journal, oldest first."""
+    with open(path, "rb") as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            record = json.loads(line)
+            if record["event"] != "start":
+                yield record
+
+
+def restore_record(game, songs):
+    """Journal record of a restore: the restored songs' scores, or the whole state if songs is None."""
+    if songs is None:
+        return {"event": "restore", "state": game.get_state()}
+    return {
+        "event": "restore",
+        "scores": [[song, game.total_scores[song], game.current_scores[song]] for song in songs],
+        "current_point_index": game.current_point_index,
+        "current_player_index": game.current_player_index,
+        "game_over": game.game_over,
+    }
+
+
+def apply_event(game, record):
+    """Re-applies one journal record to a game."""
+    event = record["event"]
+    if event == "assign":
+        game.assign_point(record["song"])
+    elif event == "ballot":
+        game.assign_points_batch(record["player"], [tuple(entry) for entry in record["ballot"]])
+    elif event == "finalize":
+        game.finalize_turn()
+    elif event == "reset":
+        game.reset_turn()
+    elif event == "submit":
+        game.submit_ballot(record["player"], [tuple(entry) for entry in record["ballot"]])
+    elif event == "withdraw":
+        game.withdraw_ballot(record["player"])
+    elif event == "restore":
+        if "state" in record:
+            game.set_state(record["state"])
+        else:
+            game.restore({song: (total, current) for song, total, current in record["scores"]},
+                         record["current_point_index"], record["current_player_index"], record["game_over"])
+
+
+class JournalReplayer(QtCore.QObject):
+    """
+    Replays a journal through the presenter window, rebuilding the spectator
+    board at an adjustable speed (2.0 = twice as fast as the original contest).
+    Pauses longer than MAX_GAP seconds of contest time are shortened.
+    """
+    MAX_GAP = 3.0
+
+    def __init__(self, presenter, path, speed=1.0, parent=None):
+        super().__init__(parent)
+        self.presenter = presenter
+        self.events = list(read_events(path))
+        self.speed = speed
+        self.position = 0
+        self.timer = QtCore.QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.step)
+
+    def start(self):
+        if self.events:
+            self.timer.start(0)
+
+    def step(self):
+        record = self.events[self.position]
+        self.position += 1
+        event = record["event"]
+        if event == "assign":
+            self.presenter.assign_point(record["song"])
+        elif event == "finalize":
+            self.presenter.finalize_turn()
+        elif event == "reset":
+            self.presenter.reset_turn()
+        elif event == "ballot":
+            self.presenter.assign_ballot(record["player"], [tuple(entry) for entry in record["ballot"]])
+        elif event == "restore":
+            apply_event(self.presenter.game, record)
+            self.presenter.show_restored()
+        elif event in ("submit", "withdraw"):
+            apply_event(self.presenter.game, record)
+        if self.position < len(self.events):
+            gap = min(self.events[self.position]["t"] - record["t"], self.MAX_GAP)
+            self.timer.start(max(0, int(gap * 1000 / self.speed)))
@@ -1,26 +1,134 @@
+import argparse
+import os
 import sys
+import time
 from PyQt5 import QtWidgets
-from game import Game
+from archive import Archive, VoteRecorder
+from game import create_game
 from spectator_window import SpectatorWindow
 from presenter_window import PresenterWindow
 from background_customizer import BackgroundCustomizer
+from broadcast import BroadcastRenderer, EncoderPipeline, open_sink, DEFAULT_FPS, DEFAULT_SIZE
+from fanout import StatePublisher
+from journal import VoteJournal, JournalReplayer
+from perf import profiler
+from projection import ProjectionEngine, ProjectionService
+from vote_server import BallotBridge, VoteServer
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Song contest scoreboard")
+    parser.add_argument("--contest", metavar="PATH",
+                        help="open a compiled contest file (see catalog.py) instead of songs.txt/players.txt")
+    parser.add_argument("--painted", action="store_true",
+                        help="draw the spectator board in a single paint pass")
+    parser.add_argument("--reduced-motion", action="store_true",
+                        help="move songs to their new rank without animation")
+    parser.add_argument("--journal", metavar="PATH",
+                        help="record every vote to PATH; if PATH exists, resume the contest from it")
+    parser.add_argument("--replay", metavar="PATH",
+                        help="replay a recorded journal on the spectator board")
+    parser.add_argument("--replay-speed", type=float, default=1.0,
+                        help="replay speed multiplier (default: 1.0)")
+    parser.add_argument("--serve-votes", type=int, metavar="PORT",
+                        help="accept juror ballots over HTTP on localhost:PORT")
+    parser.add_argument("--reveal-interval", type=int, default=0, metavar="MS",
+                        help="with --serve-votes, reveal collected ballots automatically, one juror "
+                             "every MS ms (default: 0, as soon as they arrive)")
+    parser.add_argument("--odds", action="store_true",
+                        help="show Monte Carlo win odds on the presenter window")
+    parser.add_argument("--perf", action="store_true",
+                        help="show the performance overlay on the spectator window (toggle with F3)")
+    parser.add_argument("--perf-trace", metavar="PATH",
+                        help="record hot-path timings and write a Chrome trace to PATH on exit")
+    parser.add_argument("--broadcast", metavar="TARGET",
+                        help="also render the board offscreen at 1920x1080 to TARGET: a directory "
+                             "(PNG frames), a .raw file, a video file (via ffmpeg) or - (raw to stdout)")
+    parser.add_argument("--archive", metavar="PATH",
+                        help="on exit, add this contest's votes and results to the archive at PATH")
+    parser.add_argument("--archive-name", metavar="NAME",
+                        help="name of the contest in the archive (default: contest file and date)")
+    parser.add_argument("--displays", type=int, default=0, metavar="N",
+                        help="render the spectator board in N separate processes (full screen on "
+                             "screens 1..N when available) instead of in the presenter's process")
+    return parser.parse_args(argv)
 
 
 def main():
     app = QtWidgets.QApplication(sys.argv)
-    # Initialize the game with songs.txt and players.txt.
-    game = Game("songs.txt", "players.txt")
+    args = parse_args(app.arguments()[1:])
+    # Initialize the game with songs.txt and players.txt
+    # (array-backed scoring when NumPy is available).
+    if args.contest:
+        game = create_game(args.contest)
+    else:
+        game = create_game("songs.txt", "players.txt")
+    for kind, collisions in (("song", game.song_collisions), ("player", game.player_collisions)):
+        for entry, lines in collisions.items():
+            print(f"Warning: duplicate {kind} {entry!r} on lines {lines}; kept the first", file=sys.stderr)
+    if args.archive:
+        # Attached before crash recovery, so that replayed journal votes are recorded too.
+        recorder = VoteRecorder(game)
+        name = args.archive_name or "{} {}".format(
+            os.path.splitext(os.path.basename(args.contest or "songs.txt"))[0], time.strftime("%Y-%m-%d %H:%M"))
+
+        def archive_contest():
+            archive = Archive(args.archive)
+            archive.add_game(name, game, recorder)
+            archive.save()
+        app.aboutToQuit.connect(archive_contest)
+    # Crash recovery: restore the game from the journal before any window reads it.
+    if args.journal and not args.replay:
+        journal = VoteJournal(game, args.journal)
+        app.aboutToQuit.connect(journal.close)
 
-    spectator_win = SpectatorWindow(game)
+    if args.displays:
+        # The boards live in their own processes; the publisher stands in for the spectator window.
+        spectator_win = StatePublisher(game)
+        display_args = ["--contest", args.contest] if args.contest else []
+        display_args += ["--painted"] if args.painted else []
+        display_args += ["--reduced-motion"] if args.reduced_motion else []
+        for i in range(args.displays):
+            spectator_win.spawn(display_args, screen=i + 1)
+        app.aboutToQuit.connect(spectator_win.close)
+    else:
+        spectator_win = SpectatorWindow(game, painted=args.painted)
+        spectator_win.set_reduced_motion(args.reduced_motion)
+        spectator_win.set_perf_overlay(args.perf)
 
-    # Optionally apply a background customizer to the spectator window.
-    # For example, set a background color or provide a path to an image.
-    customizer = BackgroundCustomizer(background_image_path=None, background_color=None)
-    spectator_win.set_background(customizer)
+        # Optionally apply a background customizer to the spectator window.
+        # For example, set a background color or provide a path to an image.
+        customizer = BackgroundCustomizer(background_image_path=None, background_color=None)
+        spectator_win.set_background(customizer)
+    if args.perf_trace:
+        profiler.enable()
+        app.aboutToQuit.connect(lambda: profiler.export_trace(args.perf_trace))
 
     presenter_win = PresenterWindow(game, spectator_win)
+    if args.replay:
+        replayer = JournalReplayer(presenter_win, args.replay, speed=args.replay_speed)
+        replayer.start()
+    if args.odds:
+        engine = ProjectionEngine()
+        projections = ProjectionService(game, engine)
+        projections.updated.connect(presenter_win.update_odds)
+        projections.refresh()
+        app.aboutToQuit.connect(engine.shutdown)
+    if args.broadcast:
+        pipeline = EncoderPipeline(open_sink(args.broadcast, DEFAULT_SIZE, DEFAULT_FPS))
+        broadcaster = BroadcastRenderer(game, pipeline)
+        broadcaster.start()
+        app.aboutToQuit.connect(broadcaster.stop)
+    if args.serve_votes is not None:
+        bridge = BallotBridge(presenter_win)
+        presenter_win.sequencer.set_interval(args.reveal_interval)
+        presenter_win.set_auto_reveal(True)
+        server = VoteServer(bridge, port=args.serve_votes)
+        server.start()
+        app.aboutToQuit.connect(server.stop)
 
-    spectator_win.show()
+    if not args.displays:
+        spectator_win.show()
     presenter_win.show()
     sys.exit(app.exec_())
 
@@ -0,0 +1,166 @@
+# perf.py
+import collections
+import functools
+import json
+import os
+import threading
+import time
+
+
+class Histogram:
+    """Keeps the last `capacity` samples (in ms) in a ring buffer."""
+    def __init__(self, capacity=1024):
+        self.samples = [0.0] * capacity
+        self.capacity = capacity
+        self.index = 0
+        self.count = 0  # Samples recorded since the last clear, including overwritten ones
+
+    def add(self, value):
+        self.samples[self.index] = value
+        self.index = (self.index + 1) % self.capacity
+        self.count += 1
+
+    def values(self):
+        return self.samples[:min(self.count, self.capacity)]
+
+    def percentile(self, fraction):
+        values = sorted(self.values())
+        if not values:
+            return None
+        return values[min(len(values) - 1, int(fraction * len(values)))]
+
+    def clear(self):
+        self.index = 0
+        self.count = 0
+
+
+class Profiler:
+    """
+    Collects timings of the scoreboard's hot paths.
+
+    Disabled by default: the hooks (the @timed decorator and the mark_*
+    calls) then cost one attribute check. Once enabled, every timed call
+    goes into a per-name ring-buffer Histogram and into a bounded list of
+    trace spans that export_trace() writes in the Chrome trace event
+    format (chrome://tracing, Perfetto).
+
+    It also follows the spectator frames: frame rate, frames dropped while
+    songs move, and the latency from a vote to the first frame that shows it.
+    """
+    TRACE_CAPACITY = 100_000  # Spans kept for export; older ones are dropped
+    FPS_WINDOW = 1.0          # Seconds over which the frame rate is measured
+
+    def __init__(self):
+        self.enabled = False
+        self.histograms = {}
+        self.spans = [None] * self.TRACE_CAPACITY
+        self.span_index = 0
+        self.span_count = 0
+        self.frame_times = collections.deque()
+        self.last_frame = None
+        self.dropped_frames = 0
+        self.vote_cast = None     # perf_counter of the oldest vote not yet applied to the board
+        self.vote_applied = None  # ... and of the oldest applied vote not yet painted
+        self.origin = time.perf_counter()
+
+    def enable(self, enabled=True):
+        self.enabled = enabled
+
+    def histogram(self, name):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram()
+        return histogram
+
+    def record(self, name, start, end):
+        """Records a span between two time.perf_counter() values."""
+        self.histogram(name).add((end - start) * 1000)
+        self.spans[self.span_index] = (name, start, end, threading.get_ident())
+        self.span_index = (self.span_index + 1) % self.TRACE_CAPACITY
+        self.span_count += 1
+
+    # --- Frames and votes ---
+    def mark_vote(self):
+        """A vote changed the game; the board has yet to show it."""
+        if self.enabled and self.vote_cast is None:
+            self.vote_cast = time.perf_counter()
+
+    def mark_applied(self):
+        """The board applied the pending votes; the next frame shows them."""
+        if self.enabled and self.vote_cast is not None:
+            if self.vote_applied is None:
+                self.vote_applied = self.vote_cast
+            self.vote_cast = None
+
+    def mark_frame(self, expected_interval=None):
+        """
+        A spectator frame was painted. expected_interval (ms) is the frame
+        interval of a running animation; longer gaps count as dropped frames.
+        """
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        if self.vote_applied is not None:
+            start, self.vote_applied = self.vote_applied, None
+            self.record("vote_to_render", start, now)
+        if expected_interval and self.last_frame is not None:
+            missed = int((now - self.last_frame) * 1000 / expected_interval - 0.5)
+            self.dropped_frames += max(0, missed)
+        self.last_frame = now
+        self.frame_times.append(now)
+        while self.frame_times[0] < now - self.FPS_WINDOW:
+            self.frame_times.popleft()
+
+    def fps(self):
+        now = time.perf_counter()
+        return sum(1 for t in self.frame_times if t >= now - self.FPS_WINDOW) / self.FPS_WINDOW
+
+    # --- Reporting ---
+    def summary(self):
+        """{name: {"count", "p50", "p99"}} for every timed hook, in ms."""
+        return {
+            name: {"count": h.count, "p50": h.percentile(0.5), "p99": h.percentile(0.99)}
+            for name, h in self.histograms.items()
+        }
+
+    def reset(self):
+        self.histograms.clear()
+        self.span_index = 0
+        self.span_count = 0
+        self.frame_times.clear()
+        self.last_frame = None
+        self.dropped_frames = 0
+        self.vote_cast = self.vote_applied = None
+
+    def export_trace(self, path):
+        """Writes the recorded spans as a Chrome trace event JSON file."""
+        count = min(self.span_count, self.TRACE_CAPACITY)
+        start = self.span_index - count
+        spans = [self.spans[i % self.TRACE_CAPACITY] for i in range(start, self.span_index)]
+        pid = os.getpid()
+        events = [{
+            "name": name, "ph": "X", "pid": pid, "tid": tid,
+            "ts": round((begin - self.origin) * 1e6, 3),
+            "dur": round((end - begin) * 1e6, 3),
+        } for name, begin, end, tid in spans]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+
+profiler = Profiler()
+
+
+def timed(name):
+    """Decorator recording the duration of each call under name while the profiler is enabled."""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not profiler.enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profiler.record(name, start, time.perf_counter())
+        return wrapper
+    return decorate
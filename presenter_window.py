@@ -1,5 +1,55 @@
 # presenter_window.py
-from PyQt5 import QtWidgets, QtCore
+from PyQt5 import QtWidgets, QtCore, QtGui
+from history import GameHistory
+from reveal import RevealSequencer
+from song_search import SongSearchIndex
+
+
+def game_info_text(game):
+    """Status line for the current player and the next point (also shown by the spectator)."""
+    if game.game_over:
+        return "Game Over"
+    current_player = game.get_current_player() or "N/A"
+    if game.current_point_index < len(game.points_sequence):
+        next_point = game.points_sequence[game.current_point_index]
+    else:
+        next_point = "Turn complete"
+    return f"Player: {current_player} | Next Point: {next_point}"
+
+
+class SongListModel(QtCore.QAbstractListModel):
+    """
+    The presenter's song list: every song in original order, labelled
+    "(number) title", optionally narrowed down by a search query. Rows are
+    produced on demand, so thousands of songs cost no widgets.
+    """
+    def __init__(self, game, parent=None):
+        super().__init__(parent)
+        self.game = game
+        self.search_index = SongSearchIndex(game.songs)
+        self.rows = list(range(len(game.songs)))  # Song indices currently shown
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == QtCore.Qt.DisplayRole:
+            i = self.rows[index.row()]
+            return f"({i + 1}) {self.game.songs[i]}"
+        return None
+
+    def song(self, row):
+        if 0 <= row < len(self.rows):
+            return self.game.songs[self.rows[row]]
+        return None
+
+    def set_filter(self, query):
+        self.beginResetModel()
+        self.rows = self.search_index.search(query)
+        self.endResetModel()
+
 
 class PresenterWindow(QtWidgets.QMainWindow):
     def __init__(self, game, spectator_window):
@@ -7,7 +57,7 @@ class PresenterWindow(QtWidgets.QMainWindow):
         self.game = game
         self.spectator_window = spectator_window
         self.setWindowTitle("Presenter Window")
-        # Set a larger initial size to accommodate all song buttons.
+        # Set a larger initial size to show plenty of songs at once.
         self.resize(600, 600)
 
         central = QtWidgets.QWidget()
@@ -19,19 +69,33 @@ class PresenterWindow(QtWidgets.QMainWindow):
         self.info_label = QtWidgets.QLabel("")
         self.main_layout.addWidget(self.info_label)
 
-        # Create a scroll area for the song buttons.
-        self.scroll_area = QtWidgets.QScrollArea()
-        self.scroll_area.setWidgetResizable(True)
-        self.main_layout.addWidget(self.scroll_area)
+        # Projected odds, shown when a ProjectionService is attached (see update_odds).
+        self.odds_label = QtWidgets.QLabel("")
+        self.odds_label.hide()
+        self.main_layout.addWidget(self.odds_label)
 
-        # Container for song buttons.
-        self.buttons_container = QtWidgets.QWidget()
-        self.buttons_layout = QtWidgets.QVBoxLayout()
-        self.buttons_container.setLayout(self.buttons_layout)
-        self.scroll_area.setWidget(self.buttons_container)
+        # Search box: filters the song list as you type; Enter assigns the next point.
+        self.search_box = QtWidgets.QLineEdit()
+        self.search_box.setPlaceholderText("Search songs (title, artist or number)")
+        self.search_box.setClearButtonEnabled(True)
+        self.main_layout.addWidget(self.search_box)
 
-        # Create buttons for each song in the original order.
-        self.create_song_buttons()
+        # Song list in original order; the view only lays out the visible rows.
+        self.song_model = SongListModel(self.game)
+        self.song_list = QtWidgets.QListView()
+        self.song_list.setModel(self.song_model)
+        self.song_list.setUniformItemSizes(True)
+        # Lay out long result lists in batches across event-loop passes.
+        self.song_list.setLayoutMode(QtWidgets.QListView.Batched)
+        self.song_list.setBatchSize(200)
+        self.song_list.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.main_layout.addWidget(self.song_list)
+        self.song_list.clicked.connect(self.assign_index)
+        self.song_list.installEventFilter(self)
+        self.search_box.textChanged.connect(self.filter_songs)
+        self.search_box.returnPressed.connect(self.assign_selected)
+        self.search_box.installEventFilter(self)
+        self.select_row(0)
 
         # Layout for control buttons.
         self.control_layout = QtWidgets.QHBoxLayout()
@@ -47,35 +111,111 @@ class PresenterWindow(QtWidgets.QMainWindow):
         self.control_layout.addWidget(self.reset_button)
         self.reset_button.clicked.connect(self.reset_turn)
 
+        # Ballots collected ahead of their turn (Game.submit_ballot): revealed one per
+        # click, or back to back by the sequencer while Auto Reveal is checked.
+        self.sequencer = RevealSequencer(self)
+        self.reveal_button = QtWidgets.QPushButton("Reveal Next")
+        self.control_layout.addWidget(self.reveal_button)
+        self.reveal_button.clicked.connect(self.reveal_next)
+        self.auto_reveal_box = QtWidgets.QCheckBox("Auto Reveal")
+        self.control_layout.addWidget(self.auto_reveal_box)
+        self.auto_reveal_box.toggled.connect(self.set_auto_reveal)
+        self.pending_label = QtWidgets.QLabel("")
+        self.main_layout.addWidget(self.pending_label)
+        self.game.add_listener(self.on_game_event)
+
+        # Undo/redo of any step, including a finalized turn (Ctrl+Z / Ctrl+Shift+Z).
+        self.history = GameHistory(self.game)
+        self.undo_button = QtWidgets.QPushButton("Undo")
+        self.control_layout.addWidget(self.undo_button)
+        self.undo_button.clicked.connect(self.undo)
+        self.redo_button = QtWidgets.QPushButton("Redo")
+        self.control_layout.addWidget(self.redo_button)
+        self.redo_button.clicked.connect(self.redo)
+        QtWidgets.QShortcut(QtGui.QKeySequence.Undo, self, self.undo)
+        QtWidgets.QShortcut(QtGui.QKeySequence.Redo, self, self.redo)
+
+        # Timeline: drag to show the board as it was at any earlier step (e.g. for a recap).
+        self.timeline = QtWidgets.QSlider(QtCore.Qt.Horizontal)
+        self.timeline.valueChanged.connect(self.seek_history)
+        self.main_layout.addWidget(self.timeline)
+        self.timeline_label = QtWidgets.QLabel("")
+        self.main_layout.addWidget(self.timeline_label)
+
         self.update_info()
 
-    def create_song_buttons(self):
-        # Clear existing buttons if any.
-        for i in reversed(range(self.buttons_layout.count())):
-            widget = self.buttons_layout.itemAt(i).widget()
-            if widget:
-                widget.setParent(None)
-        # Create a button for each song in original order.
-        for song in self.game.songs:
-            original_number = self.game.original_order[song] + 1
-            button_text = f"({original_number}) {song}"
-            button = QtWidgets.QPushButton(button_text)
-            button.clicked.connect(lambda checked, s=song: self.assign_point(s))
-            self.buttons_layout.addWidget(button)
+    def filter_songs(self, text):
+        self.song_model.set_filter(text)
+        self.select_row(0)
+
+    def select_row(self, row):
+        if 0 <= row < self.song_model.rowCount():
+            index = self.song_model.index(row)
+            self.song_list.setCurrentIndex(index)
+            self.song_list.scrollTo(index)
+
+    def eventFilter(self, obj, event):
+        if event.type() == QtCore.QEvent.KeyPress:
+            # Up/Down in the search box move through the matches without leaving it.
+            step = {QtCore.Qt.Key_Down: 1, QtCore.Qt.Key_Up: -1}.get(event.key())
+            if obj is self.search_box and step:
+                self.select_row(self.song_list.currentIndex().row() + step)
+                return True
+            # Enter on the list assigns like a click.
+            if obj is self.song_list and event.key() in (QtCore.Qt.Key_Return, QtCore.Qt.Key_Enter):
+                self.assign_index(self.song_list.currentIndex())
+                return True
+        return super().eventFilter(obj, event)
+
+    def assign_index(self, index):
+        song = self.song_model.song(index.row()) if index.isValid() else None
+        if song is not None:
+            self.assign_point(song)
+
+    def assign_selected(self):
+        """Enter in the search box: assigns the next point to the highlighted match."""
+        index = self.song_list.currentIndex()
+        if index.isValid():
+            self.assign_index(index)
+            # Keep the query selected so the next one can be typed straight away.
+            self.search_box.selectAll()
 
     def update_info(self):
-        if self.game.game_over:
-            info_text = "Game Over"
-        else:
-            current_player = self.game.get_current_player() or "N/A"
-            if self.game.current_point_index < len(self.game.points_sequence):
-                next_point = self.game.points_sequence[self.game.current_point_index]
-            else:
-                next_point = "Turn complete"
-            info_text = f"Player: {current_player} | Next Point: {next_point}"
+        info_text = game_info_text(self.game)
         self.info_label.setText(info_text)
         # Also update spectator status cell.
         self.spectator_window.update_status(info_text)
+        self.update_history_controls()
+        self.update_pending()
+
+    def on_game_event(self, event, *args):
+        # Ballots may be collected (e.g. by the vote server) without going through this window.
+        if event == "pending":
+            self.update_pending()
+
+    def update_pending(self):
+        pending = len(self.game.pending_ballots)
+        ready = self.game.next_pending_ballot() is not None
+        self.pending_label.setText(f"Collected ballots: {pending}" + (" (next juror ready)" if ready else ""))
+        self.reveal_button.setEnabled(ready or self.game.is_turn_complete() and bool(pending))
+
+    def update_history_controls(self):
+        history = self.history
+        self.undo_button.setEnabled(history.can_undo())
+        self.redo_button.setEnabled(history.can_redo())
+        self.timeline.blockSignals(True)
+        self.timeline.setRange(0, len(history) - 1)
+        self.timeline.setValue(history.position)
+        self.timeline.blockSignals(False)
+        self.timeline_label.setText(f"Step {history.position}/{len(history) - 1}: {history.label(history.position)}")
+
+    def update_odds(self, projection):
+        """Shows the likeliest winners of a projection.Projection."""
+        leaders = ", ".join(
+            f"{song.split('-')[0].strip()} {win:.0%}" for song, win, _ in projection.ranked()[:3]
+        )
+        self.odds_label.setText(f"Win odds ({projection.sims:,} sims): {leaders}")
+        self.odds_label.show()
 
     def assign_point(self, song):
         if self.game.game_over:
@@ -90,6 +230,21 @@ class PresenterWindow(QtWidgets.QMainWindow):
         else:
             self.info_label.setText("All points have been distributed. Finalize turn.")
 
+    def assign_ballot(self, player, ballot):
+        """Applies a whole juror ballot [(song, points), ...] at once."""
+        if self.game.game_over:
+            self.info_label.setText("Game is over. No more points can be assigned.")
+            return
+        try:
+            points_assigned = self.game.assign_points_batch(player, ballot)
+        except ValueError as error:
+            self.info_label.setText(f"Ballot rejected: {error}")
+            return
+        if points_assigned:
+            self.spectator_window.update_last_voted(self.game.highlighted_song(ballot))
+            self.spectator_window.update_view()
+            self.update_info()
+
     def finalize_turn(self):
         if self.game.game_over:
             self.info_label.setText("Game is over.")
@@ -107,4 +262,58 @@ class PresenterWindow(QtWidgets.QMainWindow):
             return
         self.game.reset_turn()
         self.spectator_window.update_view()
-        self.update_info()
\ No newline at end of file
+        self.update_info()
+
+    def undo(self):
+        if self.history.can_undo():
+            self.pause_auto_reveal()
+            self.history.undo()
+            self.show_restored()
+
+    def redo(self):
+        if self.history.can_redo():
+            self.history.redo()
+            self.show_restored()
+
+    def seek_history(self, position):
+        if position != self.history.position:
+            if position < self.history.position:
+                self.pause_auto_reveal()
+            self.history.seek(position)
+            self.show_restored()
+
+    def pause_auto_reveal(self):
+        # Going back puts revealed ballots back with the collected ones; the
+        # sequencer would reveal them again at once, so the operator resumes it.
+        if self.sequencer.running:
+            self.set_auto_reveal(False)
+
+    def show_restored(self):
+        """Brings both windows up to date after the game was restored to another state."""
+        self.spectator_window.update_view()
+        self.update_info()
+
+    def reveal_next(self):
+        """Finalizes a complete turn, then reveals the next juror's collected ballot as their turn."""
+        if self.game.game_over:
+            self.info_label.setText("Game is over.")
+            return False
+        if self.game.is_turn_complete():
+            self.finalize_turn()
+            if self.game.game_over:
+                return False
+        ballot = self.game.reveal_next()
+        if ballot is None:
+            self.info_label.setText(f"No ballot collected from {self.game.get_current_player()} yet.")
+            return False
+        self.spectator_window.update_last_voted(self.game.highlighted_song(ballot))
+        self.spectator_window.update_view()
+        self.update_info()
+        return True
+
+    def set_auto_reveal(self, enabled):
+        if enabled:
+            self.sequencer.start()
+        else:
+            self.sequencer.stop()
+        self.auto_reveal_box.setChecked(enabled)
@@ -0,0 +1,289 @@
+# projection.py
+import concurrent.futures
+import multiprocessing
+import os
+import time
+
+from PyQt5 import QtCore
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; projections need it.
+    np = None
+
+CHUNK_CELLS = 4_000_000  # Max simulated scores (contests x songs) held in memory at once
+
+
+def sample_distinct(rng, n, k, rows):
+    """
+    Returns a (rows, k) array of k distinct song indices per row: a uniformly
+    random ordered pick, like a juror handing out k point values in turn.
+    Column i draws among the n - i songs not picked yet and skips over the
+    earlier picks, so the cost is O(rows * k^2) whatever n is.
+    """
+    if k > n:
+        return rng.integers(0, n, size=(rows, k), dtype=np.int32)
+    draws = rng.random((k, rows))
+    picks = np.empty((k, rows), dtype=np.int32)
+    taken = np.empty((k, rows), dtype=np.int32)  # Earlier picks, ascending per row
+    for i in range(k):
+        pick = (draws[i] * (n - i)).astype(np.int32)
+        for j in range(i):
+            pick += pick >= taken[j]
+        picks[i] = pick
+        # Insert the pick into the sorted earlier picks.
+        for j in range(i):
+            low = np.minimum(taken[j], pick)
+            np.maximum(taken[j], pick, out=pick)
+            taken[j] = low
+        taken[i] = pick
+    return picks.T
+
+
+def simulate(base, ballots, sims, top_n, seed):
+    """
+    Simulates the rest of a contest sims times.
+
+    base holds every song's current score (in original order) and ballots
+    lists the point values still to be handed out, one list per remaining
+    ballot. Every simulated ballot gives its values to distinct random songs.
+    Ties rank by original order, as on the scoreboard.
+    Returns (win_counts, top_counts) as int64 arrays indexed like base.
+    """
+    rng = np.random.default_rng(seed)
+    base = np.asarray(base, dtype=np.int64)
+    n = len(base)
+    win_counts = np.zeros(n, dtype=np.int64)
+    top_counts = np.zeros(n, dtype=np.int64)
+    if n == 0:
+        return win_counts, top_counts
+    top_n = min(top_n, n)
+    tie_break = np.arange(n, dtype=np.int64)
+    chunk = max(1, CHUNK_CELLS // n)
+    done = 0
+    while done < sims:
+        m = min(chunk, sims - done)
+        scores = np.tile(base, (m, 1))
+        # Ballots of the same length are sampled together.
+        by_length = {}
+        for values in ballots:
+            by_length.setdefault(len(values), []).append(values)
+        for k, group in by_length.items():
+            if k == 0:
+                continue
+            picks = sample_distinct(rng, n, k, m * len(group))
+            values = np.tile(np.asarray(group, dtype=np.int64).ravel(), m)
+            rows = np.repeat(np.arange(m), len(group) * k)
+            scores += np.bincount(rows * n + picks.ravel(), weights=values,
+                                  minlength=m * n).astype(np.int64).reshape(m, n)
+        key = scores * n - tie_break  # Higher is better; equal scores favour the earlier song.
+        win_counts += np.bincount(key.argmax(axis=1), minlength=n)
+        top = np.argpartition(-key, top_n - 1, axis=1)[:, :top_n]
+        top_counts += np.bincount(top.ravel(), minlength=n)
+        done += m
+    return win_counts, top_counts
+
+
+class Projection:
+    """Win and top-N probabilities of every song, estimated from `sims` simulated contests."""
+    def __init__(self, songs, top_n, win_counts, top_counts, sims):
+        self.songs = songs
+        self.top_n = top_n
+        self.win_counts = win_counts
+        self.top_counts = top_counts
+        self.sims = sims
+
+    def win_probability(self, song):
+        return self.win_counts[self.songs.index(song)] / self.sims if self.sims else 0.0
+
+    def top_probability(self, song):
+        return self.top_counts[self.songs.index(song)] / self.sims if self.sims else 0.0
+
+    def ranked(self):
+        """(song, win probability, top-N probability) for every song, likeliest winner first."""
+        if not self.sims:
+            return []
+        order = np.lexsort((-self.top_counts, -self.win_counts))
+        return [(self.songs[i], self.win_counts[i] / self.sims, self.top_counts[i] / self.sims)
+                for i in order]
+
+    def merge(self, win_counts, top_counts, sims):
+        return Projection(self.songs, self.top_n, self.win_counts + win_counts,
+                          self.top_counts + top_counts, self.sims + sims)
+
+
+class ProjectionEngine:
+    """
+    Spreads contest simulations over a process pool.
+
+    Work is cut into chunks of at most chunk_sims contests with independent
+    seeds. project() sizes its chunks from the measured throughput for the
+    game's size: the first chunk is a small probe, later ones are sized to
+    finish within the time left, one per worker, so the budget is kept and
+    no queued work outlives it. It returns what has completed when the
+    budget runs out, but at least the first chunk, so callers get a
+    fixed-latency estimate whose precision depends on the machine.
+    workers=0 runs everything in-process.
+    """
+    MIN_CHUNK_SIMS = 500  # Probe size, and the smallest chunk worth submitting
+
+    def __init__(self, workers=None, top_n=3, chunk_sims=20_000):
+        if np is None:
+            raise RuntimeError("Projections require NumPy")
+        self.top_n = top_n
+        self.chunk_sims = chunk_sims
+        self.rates = {}  # (songs, ballots) -> measured simulations per second of one worker
+        self.seeds = np.random.SeedSequence()
+        self.workers = os.cpu_count() if workers is None else workers
+        self.executor = None
+        if self.workers:
+            # Spawn rather than fork: the GUI process runs Qt and server threads.
+            self.executor = concurrent.futures.ProcessPoolExecutor(
+                self.workers, mp_context=multiprocessing.get_context("spawn"))
+
+    def inputs(self, game):
+        """Current scores and remaining ballots of a game, in original song order."""
+        songs = sorted(game.original_order, key=game.original_order.get)
+        base = [game.total_scores[s] + game.current_scores[s] for s in songs]
+        ballots = []
+        if not game.game_over and game.players:
+            ballots.append(game.points_sequence[game.current_point_index:])
+            jurors_left = len(game.players) - game.current_player_index - 1
+            ballots.extend([list(game.points_sequence)] * jurors_left)
+        return songs, base, ballots
+
+    def submit(self, base, ballots, sims):
+        seed = self.seeds.spawn(1)[0]
+        if self.executor is None:
+            future = concurrent.futures.Future()
+            future.set_result(simulate(base, ballots, sims, self.top_n, seed))
+            return future
+        return self.executor.submit(simulate, base, ballots, sims, self.top_n, seed)
+
+    def chunk_size(self, shape, seconds, left):
+        """Simulations one worker can run in seconds (a probe if unmeasured), within left."""
+        rate = self.rates.get(shape)
+        size = self.MIN_CHUNK_SIMS if rate is None else int(rate * seconds)
+        return min(left, self.chunk_sims, max(self.MIN_CHUNK_SIMS, size))
+
+    def measured(self, shape, size, seconds):
+        rate = size / max(seconds, 1e-6)
+        previous = self.rates.get(shape)
+        self.rates[shape] = rate if previous is None else (previous + rate) / 2
+
+    def worth_a_chunk(self, shape, seconds):
+        rate = self.rates.get(shape)
+        return rate is not None and rate * seconds >= self.MIN_CHUNK_SIMS
+
+    def project(self, game, sims=1_000_000, budget=0.1):
+        """Estimates the outcome of game from up to sims contests, within budget seconds."""
+        songs, base, ballots = self.inputs(game)
+        shape = (len(base), len(ballots))
+        projection = Projection(songs, self.top_n, np.zeros(len(songs), dtype=np.int64),
+                                np.zeros(len(songs), dtype=np.int64), 0)
+        deadline = time.monotonic() + budget
+        left = sims
+        if self.executor is None:
+            while left and (not projection.sims or self.worth_a_chunk(shape, deadline - time.monotonic())):
+                size = self.chunk_size(shape, deadline - time.monotonic(), left)
+                started = time.monotonic()
+                win_counts, top_counts = self.submit(base, ballots, size).result()
+                self.measured(shape, size, time.monotonic() - started)
+                projection = projection.merge(win_counts, top_counts, size)
+                left -= size
+            return projection
+
+        running = {}  # future -> (size, submission time)
+
+        def launch():
+            nonlocal left
+            size = self.chunk_size(shape, deadline - time.monotonic(), left)
+            running[self.submit(base, ballots, size)] = (size, time.monotonic())
+            left -= size
+        while left and len(running) < self.workers:
+            launch()
+        while running:
+            # Out of time: report what has been simulated so far, once there is something.
+            timeout = max(0.0, deadline - time.monotonic()) if projection.sims else None
+            done, _ = concurrent.futures.wait(running, timeout, concurrent.futures.FIRST_COMPLETED)
+            if not done:
+                break
+            for future in done:
+                size, submitted = running.pop(future)
+                self.measured(shape, size, time.monotonic() - submitted)
+                projection = projection.merge(*future.result(), size)
+            while left and len(running) < self.workers and self.worth_a_chunk(shape, deadline - time.monotonic()):
+                launch()
+        for future in running:
+            future.cancel()
+        return projection
+
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+class ProjectionService(QtCore.QObject):
+    """
+    Keeps a live projection of a game for the UI without blocking it.
+
+    After every finalized turn (or restored state) the service starts a
+    fresh projection and submits chunks to the engine's process pool in the
+    background. As chunks complete it emits updated(Projection) with the
+    refined estimate, until max_sims contests have been simulated.
+    """
+    POLL_INTERVAL = 20  # ms between checks for completed chunks
+
+    updated = QtCore.pyqtSignal(object)
+
+    def __init__(self, game, engine, max_sims=1_000_000, parent=None):
+        super().__init__(parent)
+        self.game = game
+        self.engine = engine
+        self.max_sims = max_sims
+        self.projection = None
+        self.inputs = None
+        self.futures = {}
+        self.submitted = 0
+        self.timer = QtCore.QTimer(self)
+        self.timer.timeout.connect(self.poll)
+        game.add_listener(self.on_game_event)
+
+    def on_game_event(self, event, *args):
+        if event in ("finalize", "restore"):
+            self.refresh()
+
+    def refresh(self):
+        """Discards the current estimate and starts projecting the game's current state."""
+        for future in self.futures:
+            future.cancel()
+        self.futures = {}
+        songs, base, ballots = self.inputs = self.engine.inputs(self.game)
+        zeros = np.zeros(len(songs), dtype=np.int64)
+        self.projection = Projection(songs, self.engine.top_n, zeros, zeros, 0)
+        self.submitted = 0
+        self.fill()
+        self.timer.start(self.POLL_INTERVAL)
+
+    def fill(self):
+        # Keep a few chunks per worker in flight, no more, so a refresh reacts quickly.
+        in_flight = 2 * max(1, self.engine.workers)
+        _, base, ballots = self.inputs
+        while len(self.futures) < in_flight and self.submitted < self.max_sims:
+            size = min(self.engine.chunk_sims, self.max_sims - self.submitted)
+            self.futures[self.engine.submit(base, ballots, size)] = size
+            self.submitted += size
+
+    def poll(self):
+        done = [future for future in self.futures if future.done()]
+        if not done:
+            return
+        for future in done:
+            size = self.futures.pop(future)
+            if not future.cancelled():
+                win_counts, top_counts = future.result()
+                self.projection = self.projection.merge(win_counts, top_counts, size)
+        self.fill()
+        if not self.futures:
+            self.timer.stop()
+        self.updated.emit(self.projection)
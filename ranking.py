@@ -0,0 +1,171 @@
+# ranking.py
+from bisect import bisect_left, insort
+
+
+class RankIndex:
+    """
+    Incremental scoreboard ranking.
+
+    Songs are ordered by the key (-score, original index), which is exactly
+    the order the spectator used to get from a stable sorted(..., reverse=True)
+    over game.songs. Keys live in a list of sorted buckets with a Fenwick tree
+    over the bucket sizes, so moving one song costs O(log n) (plus a bucket of
+    at most 2 * LOAD keys) and rank <-> song lookups are O(log n) as well.
+    """
+    LOAD = 256  # Target bucket size; buckets are split at twice this size.
+    BULK_FRACTION = 0.125  # Share of changed songs above which apply() rebuilds
+
+    def __init__(self, scores, original_order):
+        """scores is an iterable of (song, score); original_order maps song to its index."""
+        self.keys = {song: (-score, original_order[song]) for song, score in scores}
+        self.song_by_index = {key[1]: song for song, key in self.keys.items()}
+        self._build(sorted(self.keys.values()))
+
+    def _build(self, keys):
+        self.buckets = [keys[i:i + self.LOAD] for i in range(0, len(keys), self.LOAD)]
+        self.maxes = [bucket[-1] for bucket in self.buckets]
+        self._rebuild_tree()
+
+    # --- Fenwick tree over bucket sizes ---
+    def _rebuild_tree(self):
+        tree = [0] + [len(bucket) for bucket in self.buckets]
+        for i in range(1, len(tree)):
+            parent = i + (i & -i)
+            if parent < len(tree):
+                tree[parent] += tree[i]
+        self.tree = tree
+
+    def _tree_add(self, bucket_index, delta):
+        i = bucket_index + 1
+        while i < len(self.tree):
+            self.tree[i] += delta
+            i += i & -i
+
+    def _prefix(self, bucket_index):
+        """Number of keys stored in buckets[0:bucket_index]."""
+        total = 0
+        i = bucket_index
+        while i > 0:
+            total += self.tree[i]
+            i -= i & -i
+        return total
+
+    def _locate(self, rank):
+        """Returns (bucket index, offset in bucket) of the key at the given rank."""
+        pos = 0
+        step = 1 << (len(self.tree).bit_length())
+        while step:
+            nxt = pos + step
+            if nxt < len(self.tree) and self.tree[nxt] <= rank:
+                pos = nxt
+                rank -= self.tree[nxt]
+            step >>= 1
+        return pos, rank
+
+    # --- Bucket operations ---
+    def _remove(self, key):
+        i = bisect_left(self.maxes, key)
+        bucket = self.buckets[i]
+        j = bisect_left(bucket, key)
+        rank = self._prefix(i) + j
+        del bucket[j]
+        if bucket:
+            self.maxes[i] = bucket[-1]
+            self._tree_add(i, -1)
+        else:
+            del self.buckets[i]
+            del self.maxes[i]
+            self._rebuild_tree()
+        return rank
+
+    def _insert(self, key):
+        if not self.buckets:
+            self.buckets.append([key])
+            self.maxes.append(key)
+            self._rebuild_tree()
+            return 0
+        i = min(bisect_left(self.maxes, key), len(self.buckets) - 1)
+        bucket = self.buckets[i]
+        insort(bucket, key)
+        self.maxes[i] = bucket[-1]
+        rank = self._prefix(i) + bisect_left(bucket, key)
+        if len(bucket) > 2 * self.LOAD:
+            self.buckets[i:i + 1] = [bucket[:self.LOAD], bucket[self.LOAD:]]
+            self.maxes[i:i + 1] = [self.buckets[i][-1], self.buckets[i + 1][-1]]
+            self._rebuild_tree()
+        else:
+            self._tree_add(i, 1)
+        return rank
+
+    # --- Public API ---
+    def __len__(self):
+        return len(self.keys)
+
+    def rank(self, song):
+        key = self.keys[song]
+        i = bisect_left(self.maxes, key)
+        return self._prefix(i) + bisect_left(self.buckets[i], key)
+
+    def song_at(self, rank):
+        i, j = self._locate(rank)
+        return self.song_by_index[self.buckets[i][j][1]]
+
+    def songs_between(self, first, last):
+        """Yields the songs ranked first..last (inclusive)."""
+        if first > last:
+            return
+        i, j = self._locate(first)
+        remaining = last - first + 1
+        while remaining and i < len(self.buckets):
+            for key in self.buckets[i][j:j + remaining]:
+                yield self.song_by_index[key[1]]
+                remaining -= 1
+            i, j = i + 1, 0
+
+    def order(self):
+        """All songs, best first."""
+        return [self.song_by_index[key[1]] for bucket in self.buckets for key in bucket]
+
+    def update(self, song, score):
+        """Sets a song's score. Returns (old_rank, new_rank)."""
+        old_key = self.keys[song]
+        new_key = (-score, old_key[1])
+        if new_key == old_key:
+            rank = self.rank(song)
+            return rank, rank
+        old_rank = self._remove(old_key)
+        self.keys[song] = new_key
+        return old_rank, self._insert(new_key)
+
+    def apply(self, scores):
+        """
+        Applies several score updates (song -> score) and returns a dict
+        mapping each song whose rank differs from before the call to its old
+        rank. Only the rank ranges crossed by each move are inspected, unless
+        more than a BULK_FRACTION of the songs change (a jump through the
+        game's history): then the index is rebuilt and compared in one pass.
+        """
+        if len(scores) > len(self.keys) * self.BULK_FRACTION:
+            return self._apply_bulk(scores)
+        initial_ranks = {}
+        for song, score in scores.items():
+            old_rank, new_rank = self.update(song, score)
+            if old_rank == new_rank:
+                continue
+            # Everything between the two ranks shifted by one towards old_rank.
+            shift = 1 if new_rank < old_rank else -1
+            first, last = min(old_rank, new_rank), max(old_rank, new_rank)
+            for rank, other in enumerate(self.songs_between(first, last), first):
+                if other == song:
+                    initial_ranks.setdefault(song, old_rank)
+                else:
+                    initial_ranks.setdefault(other, rank - shift)
+        return {song: rank for song, rank in initial_ranks.items() if self.rank(song) != rank}
+
+    def _apply_bulk(self, scores):
+        old_order = self.order()
+        for song, score in scores.items():
+            self.keys[song] = (-score, self.keys[song][1])
+        self._build(sorted(self.keys.values()))
+        return {song: rank for rank, (song, new_song) in enumerate(zip(old_order, self.order()))
+                if song != new_song}
@@ -0,0 +1,67 @@
+# refresh_scheduler.py
+import time
+
+from PyQt5 import QtCore
+
+
+class RefreshScheduler(QtCore.QObject):
+    """
+    Coalesces spectator refresh requests into at most one update per frame.
+
+    Callers record what changed (a combination of the SCORES, HIGHLIGHT,
+    ORDER and STATUS flags) instead of refreshing the board themselves.
+    Requests that arrive before the next frame are merged, and apply is
+    then called once with the combined flags and the latest status text.
+    """
+    SCORES = 1     # Some song's total or current score changed
+    HIGHLIGHT = 2  # The last voted song changed
+    ORDER = 4      # The ranking may have changed
+    STATUS = 8     # The info cell text changed
+
+    FRAME_INTERVAL = 16  # ms; one update per ~60 Hz display frame
+
+    def __init__(self, apply, parent=None):
+        """apply is called as apply(changes, status) with the merged request."""
+        super().__init__(parent)
+        self.apply = apply
+        self.changes = 0
+        self.status = None
+        self.last_flush = 0.0
+        self.requested = 0  # Number of request() calls
+        self.flushed = 0    # Number of coalesced updates applied
+        self.skipped = 0    # Requests that added nothing to an already pending update
+        self.timer = QtCore.QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.flush)
+
+    @property
+    def merged(self):
+        """Requests folded into another update instead of causing their own."""
+        return self.requested - self.flushed - self.pending
+
+    @property
+    def pending(self):
+        return 1 if self.changes else 0
+
+    def request(self, changes, status=None):
+        self.requested += 1
+        if self.changes & changes == changes and (status is None or status == self.status):
+            self.skipped += 1
+        self.changes |= changes
+        if status is not None:
+            self.status = status
+        if not self.timer.isActive():
+            since_flush = (time.monotonic() - self.last_flush) * 1000
+            self.timer.start(max(0, int(self.FRAME_INTERVAL - since_flush)))
+
+    def flush(self):
+        """Applies the pending update now (also used to force a synchronous refresh)."""
+        self.timer.stop()
+        if not self.changes:
+            return
+        changes, status = self.changes, self.status
+        self.changes = 0
+        self.status = None
+        self.last_flush = time.monotonic()
+        self.flushed += 1
+        self.apply(changes, status)
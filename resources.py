@@ -0,0 +1,121 @@
+# resources.py
+import collections
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+# One stylesheet for every spectator widget, installed once on the application
+# instead of being parsed again for each cell.
+SPECTATOR_STYLESHEET = """
+/* spectator */
+QLabel#songTotal { background-color: #1b0f2a; color: white; }
+QLabel#songTitle { background-color: rgba(59, 38, 67, 127); color: white; padding-left: 15px; }
+QWidget#infoCell, QWidget#infoCell QLabel {
+    background-color: rgba(20, 20, 20, 180);
+    border: 2px solid white;
+    border-radius: 5px;
+}
+QLabel#infoLabel { color: white; }
+QLabel#perfOverlay { background-color: rgba(0, 0, 0, 160); color: #7CFC00; padding: 6px; }
+"""
+
+_fonts = {}
+_background_cache = None
+
+
+def font(family="Helvetica Neue", size=40, bold=False):
+    """Shared QFont for the given family, point size and weight."""
+    key = (family, size, bold)
+    cached = _fonts.get(key)
+    if cached is None:
+        cached = _fonts[key] = QtGui.QFont(family, size, QtGui.QFont.Bold if bold else QtGui.QFont.Normal)
+    return cached
+
+
+def install_stylesheet():
+    """Adds the spectator rules to the application stylesheet (once)."""
+    app = QtWidgets.QApplication.instance()
+    sheet = app.styleSheet()
+    if "/* spectator */" not in sheet:
+        app.setStyleSheet(sheet + SPECTATOR_STYLESHEET)
+
+
+def background_cache():
+    """The application's BackgroundImageCache."""
+    global _background_cache
+    if _background_cache is None:
+        _background_cache = BackgroundImageCache()
+    return _background_cache
+
+
+class ImageTask(QtCore.QRunnable):
+    """Decodes (unless already decoded) and scales one image in a worker thread."""
+    def __init__(self, loader, path, size, original):
+        super().__init__()
+        self.loader = loader
+        self.path = path
+        self.size = size
+        self.original = original
+
+    def run(self):
+        original = self.original
+        if original is None:
+            original = QtGui.QImageReader(self.path).read()
+        scaled = QtGui.QImage()
+        if not original.isNull():
+            scaled = original.scaled(self.size, QtCore.Qt.KeepAspectRatioByExpanding,
+                                     QtCore.Qt.SmoothTransformation)
+        self.loader.loaded.emit(self.path, self.size, original, scaled)
+
+
+class BackgroundImageCache(QtCore.QObject):
+    """
+    Background images decoded off the UI thread and kept pre-scaled.
+
+    request(path, size, callback) calls back with a QPixmap of the image
+    scaled to cover size: right away if that variant is cached, otherwise
+    once a QThreadPool worker has decoded and scaled it. Decoded originals
+    and scaled variants are both kept in LRU order, so switching between a
+    few window sizes neither decodes nor scales again.
+    """
+    MAX_VARIANTS = 6   # Scaled pixmaps kept (path, size)
+    MAX_ORIGINALS = 2  # Decoded full-size images kept
+
+    loaded = QtCore.pyqtSignal(str, QtCore.QSize, QtGui.QImage, QtGui.QImage)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.variants = collections.OrderedDict()   # (path, width, height) -> QPixmap
+        self.originals = collections.OrderedDict()  # path -> QImage
+        self.pending = {}                           # (path, width, height) -> callbacks
+        self.pool = QtCore.QThreadPool.globalInstance()
+        self.loaded.connect(self.on_loaded)
+
+    def request(self, path, size, callback):
+        key = (path, size.width(), size.height())
+        pixmap = self.variants.get(key)
+        if pixmap is not None:
+            self.variants.move_to_end(key)
+            callback(pixmap)
+            return
+        callbacks = self.pending.setdefault(key, [])
+        callbacks.append(callback)
+        if len(callbacks) == 1:
+            self.pool.start(ImageTask(self, path, QtCore.QSize(size), self.originals.get(path)))
+
+    def on_loaded(self, path, size, original, scaled):
+        key = (path, size.width(), size.height())
+        callbacks = self.pending.pop(key, [])
+        if original.isNull():
+            return  # Unreadable image: keep the current background.
+        self.originals[path] = original
+        self.originals.move_to_end(path)
+        while len(self.originals) > self.MAX_ORIGINALS:
+            self.originals.popitem(last=False)
+        if scaled.isNull():
+            return  # Too large to scale (out of memory): keep the current background.
+        pixmap = QtGui.QPixmap.fromImage(scaled)
+        self.variants[key] = pixmap
+        while len(self.variants) > self.MAX_VARIANTS:
+            self.variants.popitem(last=False)
+        for callback in callbacks:
+            callback(pixmap)
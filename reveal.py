@@ -0,0 +1,94 @@
+# reveal.py
+import time
+
+from PyQt5 import QtCore
+
+
+class RevealSequencer(QtCore.QObject):
+    """
+    Reveals collected ballots (see Game.submit_ballot) through the presenter,
+    one juror after the other in player order, without a click per juror.
+
+    While running, every collected ballot whose turn has come is revealed:
+    the sequencer finalizes the turn it revealed last and reveals the next
+    one. With an interval, each revealed turn stays on the board for that
+    many ms so spectators can follow the moves; with interval 0 ballots are
+    merged as fast as they come, for at most APPLY_BUDGET seconds per
+    event-loop pass so the board keeps animating. A turn the presenter has
+    started by hand is never mixed with a collected ballot.
+    """
+    APPLY_BUDGET = 0.008
+
+    def __init__(self, presenter, interval=0, parent=None):
+        super().__init__(parent)
+        self.presenter = presenter
+        self.game = presenter.game
+        self.interval = interval
+        self.running = False
+        self.stepping = False        # Set while step() reveals; its own events schedule nothing
+        self.revealed_player = None  # Index of the player whose turn the sequencer revealed last
+        self.last_reveal = None      # time.monotonic() of that reveal
+        self.revealed = 0
+        self.timer = QtCore.QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.step)
+        self.game.add_listener(self.on_game_event)
+
+    def start(self):
+        self.running = True
+        self.schedule()
+
+    def stop(self):
+        self.running = False
+        self.timer.stop()
+
+    def set_interval(self, interval):
+        self.interval = interval
+
+    def on_game_event(self, event, *args):
+        # An undo takes the turn back from the sequencer; the presenter decides what comes next.
+        if event == "restore":
+            self.revealed_player = None
+        # A new ballot, or a turn finished by hand, may let the next reveal go.
+        if event in ("pending", "finalize", "reset", "restore"):
+            self.schedule()
+
+    def schedule(self):
+        if not self.running or self.stepping or self.timer.isActive():
+            return
+        delay = 0
+        if self.interval and self.last_reveal is not None:
+            delay = max(0, int(self.interval - 1000 * (time.monotonic() - self.last_reveal)))
+        self.timer.start(delay)
+
+    def owns_turn(self):
+        """Whether the current turn is a complete turn revealed by the sequencer."""
+        game = self.game
+        return (self.revealed_player == game.current_player_index and not game.game_over
+                and game.is_turn_complete())
+
+    def step(self):
+        if not self.running:
+            return
+        self.stepping = True
+        try:
+            more = self.reveal_ready()
+        finally:
+            self.stepping = False
+        if more:
+            self.schedule()
+
+    def reveal_ready(self):
+        """Reveals ballots until the interval or budget stops it; False once none is ready."""
+        deadline = time.perf_counter() + self.APPLY_BUDGET
+        while True:
+            if self.owns_turn():
+                self.presenter.finalize_turn()
+            if self.game.next_pending_ballot() is None:
+                return False
+            self.revealed_player = self.game.current_player_index
+            self.presenter.reveal_next()
+            self.last_reveal = time.monotonic()
+            self.revealed += 1
+            if self.interval or time.perf_counter() >= deadline:
+                return True
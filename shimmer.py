@@ -0,0 +1,104 @@
+# shimmer.py
+import time
+
+from PyQt5 import QtCore, QtGui
+
+
+class ShimmerBackground(QtCore.QObject):
+    """
+    Animated gradient background for the spectator board.
+
+    The gradient only varies horizontally, so each frame of the shimmer is
+    cached as a one-pixel-high pixmap strip as wide as the window and
+    stretched over the full height when painted. The strips form a ring of
+    FRAME_COUNT frames that is rebuilt only when the width changes.
+
+    The frame rate adapts: when ticks arrive late (the GUI thread is busy)
+    the interval backs off, and it recovers while ticks are on time. While
+    the widget is hidden the shimmer pauses. Each tick repaints only the
+    part of the widget not covered by opaque content.
+    """
+    FRAME_COUNT = 100     # Frames in one sweep of the highlight (offset 0.0 .. 1.0)
+    BASE_INTERVAL = 50    # ms between frames when the machine keeps up
+    MAX_INTERVAL = 400    # Slowest interval when backing off under load
+    HIDDEN_INTERVAL = 500  # Polling interval while the widget is not visible
+    COLOR1 = QtGui.QColor(30, 30, 60)  # Dark blue
+    COLOR2 = QtGui.QColor(80, 0, 80)   # Deep purple
+
+    def __init__(self, widget, opaque_region=None):
+        """opaque_region is an optional callable returning the QRegion of the
+        widget that is covered by opaque content and never needs the shimmer."""
+        super().__init__(widget)
+        self.widget = widget
+        self.opaque_region = opaque_region
+        self.offset = 0.0
+        self.frames = [None] * (self.FRAME_COUNT + 1)
+        self.frame_width = 0
+        self.interval = self.BASE_INTERVAL
+        self.last_tick = None
+        self.timer = QtCore.QTimer(self)
+        self.timer.timeout.connect(self.tick)
+        self.timer.start(self.interval)
+
+    def frame(self, width):
+        """The cached strip for the current offset, rendering it on first use."""
+        if width != self.frame_width:
+            self.frames = [None] * (self.FRAME_COUNT + 1)
+            self.frame_width = width
+        index = round(self.offset * self.FRAME_COUNT)
+        strip = self.frames[index]
+        if strip is None:
+            strip = QtGui.QPixmap(max(1, width), 1)
+            gradient = QtGui.QLinearGradient(0, 0, width, 0)
+            gradient.setColorAt(0.0, self.COLOR1)
+            gradient.setColorAt(index / self.FRAME_COUNT, self.COLOR2)
+            gradient.setColorAt(1.0, self.COLOR1)
+            painter = QtGui.QPainter(strip)
+            painter.fillRect(strip.rect(), gradient)
+            painter.end()
+            self.frames[index] = strip
+        return strip
+
+    def paint(self, painter, rect):
+        painter.drawPixmap(rect, self.frame(rect.width()))
+
+    def seek(self, seconds):
+        """
+        Stops the timer and shows the sweep as it is `seconds` after it
+        started (offscreen rendering with its own clock).
+        """
+        self.timer.stop()
+        sweep = self.BASE_INTERVAL * self.FRAME_COUNT / 1000
+        self.offset = (seconds / sweep) % 1.0
+
+    def set_interval(self, interval):
+        if interval != self.interval:
+            self.interval = interval
+            self.timer.setInterval(interval)
+
+    def tick(self):
+        now = time.monotonic()
+        elapsed = None if self.last_tick is None else (now - self.last_tick) * 1000
+        self.last_tick = now
+
+        if not self.widget.isVisible() or self.widget.visibleRegion().isEmpty():
+            self.set_interval(self.HIDDEN_INTERVAL)
+            return
+        if self.interval == self.HIDDEN_INTERVAL or elapsed is None:
+            self.set_interval(self.BASE_INTERVAL)
+        elif elapsed > self.interval * 1.5:
+            # Ticks arrive late: the GUI thread is busy, so shimmer less often.
+            self.set_interval(min(self.MAX_INTERVAL, self.interval * 2))
+        elif elapsed < self.interval * 1.1 and self.interval > self.BASE_INTERVAL:
+            self.set_interval(max(self.BASE_INTERVAL, int(self.interval * 0.8)))
+
+        # Advance by the time actually elapsed so the sweep speed stays constant.
+        step = (elapsed or self.BASE_INTERVAL) / self.BASE_INTERVAL / self.FRAME_COUNT
+        self.offset += min(step, 0.25)
+        if self.offset > 1.0:
+            self.offset = 0.0
+
+        region = QtGui.QRegion(self.widget.rect())
+        if self.opaque_region is not None:
+            region -= self.opaque_region()
+        self.widget.update(region)
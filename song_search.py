@@ -0,0 +1,76 @@
+# song_search.py
+import re
+import unicodedata
+
+WORD_RE = re.compile(r"\w+")
+# Combining marks left by NFKD, except the breve of й, a letter of its own in Russian.
+MARK_RE = re.compile(r"(?<!и)\u0306|[\u0300-\u0305\u0307-\u036f]")
+PREFIX_LENGTH = 2  # Queries shorter than a trigram are answered from word prefixes
+
+
+def normalize(text):
+    """Case- and accent-insensitive form used for matching (é matches e and ё matches е; й stays apart)."""
+    text = unicodedata.normalize("NFKD", text.casefold())
+    text = unicodedata.normalize("NFC", MARK_RE.sub("", text))
+    return " ".join(WORD_RE.findall(text))
+
+
+def trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class SongSearchIndex:
+    """
+    Instant search over song titles, built once when the song list is loaded.
+
+    Titles are normalized (casefolded, accents and punctuation dropped, so
+    Cyrillic ё folds into е) and indexed two ways: every trigram maps to the set of
+    songs containing it, and every word prefix of up to PREFIX_LENGTH
+    characters maps to the songs with a word starting that way. A query of
+    three or more characters intersects the trigram sets of its words
+    (smallest first) and checks the few candidates left by substring; a
+    shorter query is a word-prefix lookup. A query that is a number also
+    matches the song with that original number.
+    Results are song indices in original order.
+    """
+    def __init__(self, songs):
+        self.songs = list(songs)
+        self.titles = [normalize(song) for song in self.songs]
+        self.trigram_index = {}
+        self.prefix_index = {}
+        for i, title in enumerate(self.titles):
+            for gram in trigrams(title):
+                self.trigram_index.setdefault(gram, set()).add(i)
+            for word in title.split():
+                for length in range(1, min(PREFIX_LENGTH, len(word)) + 1):
+                    self.prefix_index.setdefault(word[:length], set()).add(i)
+
+    def search(self, query):
+        """Indices of the songs matching query, in original order (all songs for an empty query)."""
+        words = normalize(query).split()
+        if not words:
+            return list(range(len(self.songs)))
+        matches = None
+        for word in words:
+            found = self.match_word(word)
+            matches = found if matches is None else matches & found
+            if not matches:
+                break
+        result = sorted(matches)
+        if query.strip().isdigit():
+            number = int(query.strip()) - 1
+            if 0 <= number < len(self.songs):
+                result = [number] + [i for i in result if i != number]
+        return result
+
+    def match_word(self, word):
+        if len(word) <= PREFIX_LENGTH:
+            return self.prefix_index.get(word, set())
+        postings = sorted((self.trigram_index.get(gram, set()) for gram in trigrams(word)), key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates &= posting
+            if not candidates:
+                return candidates
+        # Trigrams can all occur without the word itself occurring; confirm by substring.
+        return {i for i in candidates if word in self.titles[i]}
@@ -1,5 +1,14 @@
 # spectator_window.py
+import html
+
 from PyQt5 import QtWidgets, QtCore, QtGui
+from animation_engine import MoveAnimator
+from perf import profiler, timed
+from ranking import RankIndex
+from refresh_scheduler import RefreshScheduler
+import resources
+import text_fit
+from shimmer import ShimmerBackground
 
 # Layout and style constants
 CELL_SPACING = 15    # vertical gap between cells
@@ -14,158 +23,348 @@ LEFT_WIDTH = 120     # Wider left section for scores
 RIGHT_WIDTH = 480    # SONG_WIDTH = LEFT_WIDTH + RIGHT_WIDTH
 COLUMN_SPACING = 40  # Increased horizontal spacing between columns
 POINT_SQUARE_SIZE = 50  # Size of the square background for points
+MOVE_DURATION = 500     # Duration of a rank-change move, in ms
+TITLE_INDENT = 52       # Label padding + contents margin + leading space before a title
+BADGE_ROOM = 90         # Width kept free after a title for the point badge
+TITLE_WIDTH = SONG_WIDTH - LEFT_WIDTH - TITLE_INDENT - BADGE_ROOM  # Widest title shown in full
 
 # Default window size optimized for 1920x1080 displays
 DEFAULT_WINDOW_WIDTH = 1600
 DEFAULT_WINDOW_HEIGHT = 900
 
+# Virtualized view: only cells in (or near) the visible viewport exist.
+VIRTUALIZE_ABOVE = 200  # Boards with more songs than this are virtualized by default
+OVERSCAN_ROWS = 2       # Extra rows kept bound above and below the viewport
+
+def display_title(song):
+    """The part of a song name shown on the board: the title before the hyphen."""
+    return song.split('-')[0].strip()
+
+
+def title_font():
+    return resources.font("Helvetica Neue", 40, bold=True)
+
+
 class SpectatorContainer(QtWidgets.QWidget):
-    def __init__(self, game, parent=None):
+    def __init__(self, game, parent=None, virtual=False):
         super().__init__(parent)
         self.game = game
-        self.gradient_offset = 0.0  # For the shimmering background effect
-        # Cached ordering: initially based on finalized scores (plus current, which is zero)
-        self.cached_order = sorted(
-            self.game.songs,
-            key=lambda s: self.game.total_scores[s] + self.game.current_scores[s],
-            reverse=True
+        resources.install_stylesheet()
+        # In virtual mode song_cells only holds the cells bound to visible songs;
+        # unbound cells wait in cell_pool to be reused.
+        self.virtual = virtual
+        self.viewport_rect = None  # Visible part of the container, set by the window
+        self.cell_pool = []
+        self.visible_songs = set()
+        self.opaque_cache = None  # Region covered by opaque score boxes (see opaque_region)
+        # All rank-change moves are driven by one clock.
+        self.animator = MoveAnimator(self.apply_moves, MOVE_DURATION, self)
+        self.animator.finished.connect(self.on_moves_finished)
+        # Incremental ranking: initially based on finalized scores (plus current, which is zero)
+        self.rank_index = RankIndex(
+            ((s, self.game.total_scores[s] + self.game.current_scores[s]) for s in self.game.original_order),
+            self.game.original_order
         )
-        # Keep track of the last voted song (if any)
+        # Songs whose score changed since the ranking was last brought up to date,
+        # and songs voted for in the current turn (a reset changes them again).
+        self.pending_songs = set()
+        self.turn_songs = set()
+        # Set when a turn completes, in case it is finalized before the next layout pass.
+        self.turn_completed = False
+        # Songs whose scores were restored (undo, redo, history seek); they are
+        # ranked again on the next layout pass whether or not a turn completed.
+        self.restored_songs = set()
+        # Songs whose cell shows stale data (see refresh_cells).
+        self.dirty_songs = set()
+        self.game.add_listener(self.on_game_event)
+        # Keep track of the last voted song (if any) and of the cell showing it.
         self.last_voted_song = None
+        self.highlighted_song = None
 
         # Create the info cell (for additional game information) at the bottom of the screen.
         self.info_cell = self.InfoCell(self)
         # Create a SongCell for each song (keyed by song name)
         self.song_cells = {}
-        for song in self.game.songs:
+        for song in ([] if virtual else self.game.songs):
             original_number = self.game.original_order[song] + 1
             cell = self.SongCell(song, original_number, self)
             cell.update_data(self.game.total_scores[song], self.game.current_scores[song])
             self.song_cells[song] = cell
 
-        # Timer to update the shimmering background.
-        self.timer = QtCore.QTimer(self)
-        self.timer.timeout.connect(self.update_gradient)
-        self.timer.start(50)  # Update every 50ms
+        # Shimmering background: cached frames, adaptive rate, partial repaints.
+        self.shimmer = ShimmerBackground(self, self.opaque_region)
 
         self.update_layout(initial=True)
 
-    def update_gradient(self):
-        self.gradient_offset += 0.01
-        if self.gradient_offset > 1.0:
-            self.gradient_offset = 0.0
-        self.update()  # Trigger a repaint
-
+    @timed("SpectatorContainer.paintEvent")
     def paintEvent(self, event):
         painter = QtGui.QPainter(self)
-        rect = self.rect()
-        # Create a horizontal linear gradient with shifting stops for a shimmering effect.
-        gradient = QtGui.QLinearGradient(0, 0, rect.width(), 0)
-        color1 = QtGui.QColor(30, 30, 60)  # Dark blue
-        color2 = QtGui.QColor(80, 0, 80)    # Deep purple
-        gradient.setColorAt(0.0, color1)
-        gradient.setColorAt(self.gradient_offset, color2)
-        gradient.setColorAt(1.0, color1)
-        painter.fillRect(rect, gradient)
+        self.paint_background(painter)
+        self.mark_frame()
+
+    def mark_frame(self):
+        profiler.mark_frame(self.animator.interval if self.animator.is_active() else None)
+
+    def paint_background(self, painter):
+        self.shimmer.paint(painter, self.rect())
+
+    def opaque_region(self):
+        """
+        Part of the container covered by the opaque left (score) sector of a
+        visible cell; the shimmer does not need to repaint it. Empty while
+        cells are moving, since they are then away from their slots.
+        """
+        if self.animator.is_active():
+            return QtGui.QRegion()
+        if self.opaque_cache is None:
+            metrics = self.layout_metrics()
+            region = QtGui.QRegion()
+            for rank in self.visible_ranks(metrics):
+                slot = self.slot_rect(rank, metrics)
+                region += QtCore.QRect(slot.x(), slot.y(), LEFT_WIDTH, SONG_HEIGHT)
+            self.opaque_cache = region
+        return self.opaque_cache
+
+    def on_game_event(self, event, *args):
+        if event in ("assign", "ballot"):
+            profiler.mark_vote()
+            songs = [args[0]] if event == "assign" else [song for song, _ in args[0]]
+            self.turn_songs.update(songs)
+            self.pending_songs.update(songs)
+            self.dirty_songs.update(songs)
+            if self.game.is_turn_complete():
+                self.turn_completed = True
+        elif event == "reset":
+            self.pending_songs.update(self.turn_songs)
+            self.dirty_songs.update(self.turn_songs)
+            self.turn_songs.clear()
+        elif event == "finalize":
+            self.dirty_songs.update(self.turn_songs)
+            self.turn_songs.clear()
+        elif event == "restore":
+            songs = self.game.songs if args[0] is None else args[0]
+            current = self.game.current_scores
+            self.restored_songs.update(songs)
+            self.restored_songs.update(self.turn_songs, self.pending_songs)
+            self.dirty_songs.update(self.restored_songs)
+            # Points of the restored turn still move their songs when that turn completes.
+            self.turn_songs = {song for song in self.restored_songs if current[song]}
+            self.pending_songs = set(self.turn_songs)
+            self.turn_completed = False
+            self.last_voted_song = None
+
+    def column_height(self):
+        """Height of the taller of the two song columns."""
+        n = len(self.rank_index)
+        songs_in_first_column = (n + 1) // 2
+        total_height_first_column = songs_in_first_column * SONG_HEIGHT + (songs_in_first_column - 1) * CELL_SPACING
+        total_height_second_column = (n - songs_in_first_column) * SONG_HEIGHT + max(0, (n - songs_in_first_column - 1)) * CELL_SPACING
+        return max(total_height_first_column, total_height_second_column)
+
+    def layout_metrics(self):
+        """Returns (start_x, start_y, songs_in_first_column) for the current size."""
+        n = len(self.rank_index)
 
-    def update_layout(self, initial=False):
-        container_width = self.width()
-        container_height = self.height()
-        
-        # When the turn is complete, re-sort the songs.
-        if self.game.is_turn_complete():
-            self.cached_order = sorted(
-                self.game.songs,
-                key=lambda s: self.game.total_scores[s] + self.game.current_scores[s],
-                reverse=True
-            )
-        
-        sorted_songs = self.cached_order
-        n = len(sorted_songs)
-        
         # Calculate total width needed for two columns
         total_columns_width = (2 * SONG_WIDTH) + COLUMN_SPACING
-        
+
         # Calculate starting x position to center the two columns
-        start_x = (container_width - total_columns_width) // 2
-        
+        start_x = (self.width() - total_columns_width) // 2
+
         # Calculate how many songs go in each column
         # First column gets ceiling of half if odd number of songs
         songs_in_first_column = (n + 1) // 2
-        
+
         # Calculate total height needed for all cells
-        total_height_first_column = songs_in_first_column * SONG_HEIGHT + (songs_in_first_column - 1) * CELL_SPACING
-        total_height_second_column = (n - songs_in_first_column) * SONG_HEIGHT + max(0, (n - songs_in_first_column - 1)) * CELL_SPACING
-        max_column_height = max(total_height_first_column, total_height_second_column)
-        
+        max_column_height = self.column_height()
+
         # Calculate starting y position to center vertically
-        start_y = (container_height - max_column_height) // 2
-        
-        for i, song in enumerate(sorted_songs):
-            # Determine which column this song belongs to
-            if i < songs_in_first_column:
-                # First column
-                column_index = 0
-                row_index = i
-            else:
-                # Second column
-                column_index = 1
-                row_index = i - songs_in_first_column
-            
-            # Calculate x position based on column
-            x_pos = start_x + column_index * (SONG_WIDTH + COLUMN_SPACING)
-            
-            # Calculate y position based on row within column, using the centered start_y
-            y_pos = start_y + row_index * (SONG_HEIGHT + CELL_SPACING)
-            
-            new_rect = QtCore.QRect(
-                x_pos,
-                y_pos,
-                SONG_WIDTH,
-                SONG_HEIGHT
-            )
-            
-            cell = self.song_cells[song]
-            if initial:
-                cell.setGeometry(new_rect)
-            else:
-                self.animate_move(cell, new_rect)
+        start_y = (self.height() - max_column_height) // 2
+        return start_x, start_y, songs_in_first_column
+
+    def slot_rect(self, rank, metrics):
+        """Geometry of the cell shown at the given rank."""
+        start_x, start_y, songs_in_first_column = metrics
+        # Determine which column this song belongs to
+        if rank < songs_in_first_column:
+            column_index, row_index = 0, rank
+        else:
+            column_index, row_index = 1, rank - songs_in_first_column
+        x_pos = start_x + column_index * (SONG_WIDTH + COLUMN_SPACING)
+        y_pos = start_y + row_index * (SONG_HEIGHT + CELL_SPACING)
+        return QtCore.QRect(x_pos, y_pos, SONG_WIDTH, SONG_HEIGHT)
+
+    @timed("SpectatorContainer.update_layout")
+    def update_layout(self, initial=False):
+        container_width = self.width()
 
-        # Position the info cell at the bottom of the screen.
+        # When the turn is complete, move the songs that gained points in the ranking.
+        # Restored songs move straight to the rank of the restored state, which
+        # counts the current turn only once it is complete.
+        complete = self.game.is_turn_complete() or self.turn_completed
+        scores = {}
+        if self.restored_songs:
+            scores = {
+                s: self.game.total_scores[s] + (self.game.current_scores[s] if complete else 0)
+                for s in self.restored_songs
+            }
+            self.restored_songs.clear()
+        if complete and self.pending_songs:
+            scores.update({
+                s: self.game.total_scores[s] + self.game.current_scores[s]
+                for s in self.pending_songs
+            })
+            self.pending_songs.clear()
+        moved_songs = self.rank_index.apply(scores) if scores else {}
+        self.turn_completed = False
+
+        self.opaque_cache = None
+        if initial:
+            self.animator.cancel_all()
+        metrics = self.layout_metrics()
+        if self.virtual:
+            self.sync_visible_cells(metrics, moved_songs, initial)
+        elif initial:
+            for rank, song in enumerate(self.rank_index.order()):
+                self.song_cells[song].setGeometry(self.slot_rect(rank, metrics))
+        else:
+            # Only cells whose slot actually changed need to move.
+            for song in moved_songs:
+                new_rect = self.slot_rect(self.rank_index.rank(song), metrics)
+                self.animate_move(self.song_cells[song], new_rect)
+
+        # Position the info cell at the bottom of the screen
+        # (of the visible part when the board scrolls).
+        area = self.visible_area()
         info_width = min(600, container_width - 40)  # Wider info cell
         info_x = (container_width - info_width) // 2
-        info_y = container_height - INFO_HEIGHT - MARGIN
+        info_y = area.bottom() + 1 - INFO_HEIGHT - MARGIN
         self.info_cell.setGeometry(info_x, info_y, info_width, INFO_HEIGHT)
+        self.info_cell.raise_()
+
+    # --- Virtual mode ---
+    def visible_area(self):
+        if self.virtual and self.viewport_rect is not None:
+            return self.viewport_rect
+        return self.rect()
 
+    def set_viewport(self, rect):
+        """Called by the window when the visible part of the container changes."""
+        self.viewport_rect = rect
+        self.update_layout(initial=False)
+
+    def visible_ranks(self, metrics):
+        """Ranks whose slot intersects the visible area (plus overscan rows)."""
+        start_x, start_y, songs_in_first_column = metrics
+        area = self.visible_area()
+        pitch = SONG_HEIGHT + CELL_SPACING
+        first_row = max(0, (area.top() - start_y) // pitch - OVERSCAN_ROWS)
+        last_row = (area.bottom() - start_y) // pitch + OVERSCAN_ROWS
+        n = len(self.rank_index)
+        ranks = list(range(first_row, min(last_row, songs_in_first_column - 1) + 1))
+        ranks.extend(range(songs_in_first_column + first_row,
+                           min(songs_in_first_column + last_row, n - 1) + 1))
+        return ranks
+
+    def sync_visible_cells(self, metrics, moved_songs, initial):
+        """
+        Binds pooled cells to the songs that are now visible and recycles the
+        rest. moved_songs maps songs whose rank just changed to their old rank,
+        so visible moves keep their animation: a song ranked into view starts
+        from its old slot, a song ranked out of view is recycled once it arrives
+        (see on_moves_finished).
+        """
+        visible = {self.rank_index.song_at(rank): rank for rank in self.visible_ranks(metrics)}
+        self.visible_songs = set(visible)
+        for song in [s for s in self.song_cells if s not in visible]:
+            if song in moved_songs and not initial:
+                new_rect = self.slot_rect(self.rank_index.rank(song), metrics)
+                self.animate_move(self.song_cells[song], new_rect)
+            else:
+                self.release_cell(song)
+        for song, rank in visible.items():
+            new_rect = self.slot_rect(rank, metrics)
+            cell = self.song_cells.get(song)
+            if cell is None:
+                cell = self.acquire_cell(song)
+                if song in moved_songs and not initial:
+                    cell.setGeometry(self.slot_rect(moved_songs[song], metrics))
+                    self.animate_move(cell, new_rect)
+                else:
+                    cell.setGeometry(new_rect)
+            elif initial:
+                cell.setGeometry(new_rect)
+            elif song in moved_songs:
+                self.animate_move(cell, new_rect)
+
+    def acquire_cell(self, song):
+        original_number = self.game.original_order[song] + 1
+        if self.cell_pool:
+            cell = self.cell_pool.pop()
+            cell.bind(song, original_number)
+        else:
+            cell = self.SongCell(song, original_number, self)
+        cell.force_highlight = (song == self.last_voted_song)
+        cell.update_data(self.game.total_scores[song], self.game.current_scores[song])
+        cell.show()
+        self.song_cells[song] = cell
+        return cell
+
+    def release_cell(self, song):
+        cell = self.song_cells.pop(song)
+        self.animator.cancel(cell)
+        cell.hide()
+        self.cell_pool.append(cell)
+
+    def on_moves_finished(self, cells):
+        # Recycle cells that were moving out of view.
+        if not self.virtual:
+            return
+        for cell in cells:
+            song = cell.song
+            if self.song_cells.get(song) is cell and song not in self.visible_songs:
+                self.release_cell(song)
+
+    @timed("SpectatorContainer.animate_move")
     def animate_move(self, widget, new_rect):
-        anim = QtCore.QPropertyAnimation(widget, b"geometry")
-        anim.setDuration(500)
-        anim.setStartValue(widget.geometry())
-        anim.setEndValue(new_rect)
-        anim.start()
-        widget.animation = anim  # Keep a reference to avoid garbage collection
-
-    def update_cells(self):
+        self.animator.move(widget, widget.geometry(), new_rect)
+
+    def apply_moves(self, frame):
+        """Sets the geometry of every moving cell for one animation frame."""
+        for cell, rect in frame.items():
+            cell.setGeometry(rect)
+
+    @timed("SpectatorContainer.refresh_cells")
+    def refresh_cells(self):
+        """Updates only the cells whose scores or highlight changed since the last refresh."""
         # If no points have been assigned in the current round, clear last voted highlight.
         if self.game.current_point_index == 0:
             self.last_voted_song = None
-        # Update each SongCell's displayed score and highlight flag.
-        for song, cell in self.song_cells.items():
+        if self.highlighted_song != self.last_voted_song:
+            self.dirty_songs.update(s for s in (self.highlighted_song, self.last_voted_song) if s is not None)
+            self.highlighted_song = self.last_voted_song
+        # Update each changed SongCell's displayed score and highlight flag.
+        for song in self.dirty_songs:
+            cell = self.song_cells.get(song)
+            if cell is None:
+                continue
             cell.force_highlight = (song == self.last_voted_song)
             total = self.game.total_scores[song]
             current = self.game.current_scores[song]
             cell.update_data(total, current)
-        
-        # Update layout to reflect the new scores immediately
-        self.update_layout(initial=False)
-
-    def update_last_voted(self, song):
-        """Call this method externally (e.g. from the presenter) whenever a vote is cast."""
-        self.last_voted_song = song
-        self.update_cells()
+        self.dirty_songs.clear()
+        profiler.mark_applied()
 
     def resizeEvent(self, event):
+        if self.virtual:
+            # The board is as tall as its content; the scroll area shows a window of it.
+            self.setMinimumHeight(self.column_height() + TOP_MARGIN + INFO_HEIGHT + 2 * MARGIN)
         self.update_layout(initial=True)
+        # Fit every title while idle (top ranks first), so binding or refreshing
+        # cells later finds the fit cached instead of measuring text.
+        text_fit.fitter().precompute(
+            (display_title(song) for song in self.rank_index.order()), TITLE_WIDTH, title_font()
+        )
 
     # --- Inner Classes ---
     class InfoCell(QtWidgets.QWidget):
@@ -174,13 +373,10 @@ class SpectatorContainer(QtWidgets.QWidget):
             super().__init__(parent)
             self.label = QtWidgets.QLabel(self)
             self.label.setAlignment(QtCore.Qt.AlignCenter)
-            font = QtGui.QFont("Helvetica Neue", 40)
-            self.label.setFont(font)
-            self.label.setStyleSheet("color: white;")
-            self.setStyleSheet(
-                "background-color: rgba(20, 20, 20, 180);"
-                "border: 2px solid white; border-radius: 5px;"
-            )
+            self.label.setFont(resources.font("Helvetica Neue", 40))
+            # Styled by the shared spectator stylesheet (see resources.py).
+            self.setObjectName("infoCell")
+            self.label.setObjectName("infoLabel")
 
         def update_status(self, text):
             # Replace text according to requirements
@@ -211,8 +407,7 @@ class SpectatorContainer(QtWidgets.QWidget):
         """
         def __init__(self, song, original_number, parent=None):
             super().__init__(parent)
-            self.song = song
-            self.original_number = original_number
+            self.bind(song, original_number)
             self.force_highlight = False  # (Not used in this version but preserved for further extensions.)
 
             # Create two labels for the two visual sectors.
@@ -225,8 +420,8 @@ class SpectatorContainer(QtWidgets.QWidget):
             # Enable rich text formatting so HTML tags are rendered.
             self.right_label.setTextFormat(QtCore.Qt.RichText)
 
-            # Set the specified font: Helvetica Neue Bold, 40pt.
-            font = QtGui.QFont("Helvetica Neue", 40, QtGui.QFont.Bold)
+            # Set the specified font: Helvetica Neue Bold, 40pt (shared by all cells).
+            font = title_font()
             self.left_label.setFont(font)
             self.right_label.setFont(font)
 
@@ -234,18 +429,27 @@ class SpectatorContainer(QtWidgets.QWidget):
             self.left_label.setGeometry(0, 0, LEFT_WIDTH, SONG_HEIGHT)
             self.right_label.setGeometry(LEFT_WIDTH, 0, RIGHT_WIDTH, SONG_HEIGHT)
 
-            # Apply the background colors.
-            self.left_label.setStyleSheet("background-color: #1b0f2a; color: white;")
-            # For 50% opacity, we use rgba with alpha 127 (out of 255).
-            self.right_label.setStyleSheet("background-color: rgba(59, 38, 67, 127); color: white; padding-left: 15px;")
+            # The background colors come from the shared spectator stylesheet
+            # (the right sector at 50% opacity, alpha 127 out of 255).
+            self.left_label.setObjectName("songTotal")
+            self.right_label.setObjectName("songTitle")
+
+        def bind(self, song, original_number):
+            """Points the cell at another song (used when cells are recycled)."""
+            self.song = song
+            self.original_number = original_number
 
         def update_data(self, total, current):
             # Compute the display total.
             display_total = total + current
             # LEFT sector: display the total points.
             self.left_label.setText(str(display_total))
-            # Process the song name: split at the hyphen and keep only the first part.
-            song_name = self.song.split('-')[0].strip()
+            # Process the song name: split at the hyphen and keep only the first part,
+            # shrunk or elided to fit the sector (see text_fit.py).
+            fitted, font = text_fit.fitter().fit(display_title(self.song), TITLE_WIDTH, self.right_label.font())
+            song_name = html.escape(fitted)
+            if font.pointSize() != self.right_label.font().pointSize():
+                song_name = f"<span style='font-size: {font.pointSize()}pt'>{song_name}</span>"
             
             # RIGHT sector: song details (song title and points)
             # Add spacing before the song name using Qt's spacing mechanisms
@@ -269,8 +473,180 @@ class SpectatorContainer(QtWidgets.QWidget):
             self.left_label.setGeometry(0, 0, LEFT_WIDTH, self.height())
             self.right_label.setGeometry(LEFT_WIDTH, 0, self.width() - LEFT_WIDTH, self.height())
 
+class PaintedSpectatorContainer(SpectatorContainer):
+    """
+    Spectator board drawn in a single paintEvent instead of one SongCell per song.
+
+    Every visible row is painted directly with QPainter. Texts are QStaticText
+    objects cached per song: the title is laid out once, the total and the
+    point badge only when that song's scores change, so a vote costs no HTML
+    parsing and no per-widget stylesheet evaluation. Rank changes are
+    animated by moving row rects (keyed by song) with the shared MoveAnimator.
+    """
+    LEFT_COLOR = QtGui.QColor("#1b0f2a")
+    RIGHT_COLOR = QtGui.QColor(59, 38, 67, 127)
+    BADGE_COLOR = QtGui.QColor("#21324d")
+    BADGE_GAP = 20      # Space between the title and the point badge
+    BADGE_PADDING = QtCore.QMargins(10, 5, 10, 5)  # The SongCell badge's "padding: 5px 10px"
+
+    def __init__(self, game, parent=None):
+        self.row_font = title_font()
+        # song -> [title, (total, current), total text, badge text or None, title font]
+        self.text_cache = {}
+        super().__init__(game, parent, virtual=True)
+
+    def static_text(self, text, font=None):
+        static = QtGui.QStaticText(text)
+        static.setTextFormat(QtCore.Qt.PlainText)
+        static.prepare(QtGui.QTransform(), font or self.row_font)
+        return static
+
+    def row_text(self, song):
+        """Cached static texts for a song, re-laid out only when its scores change."""
+        entry = self.text_cache.get(song)
+        if entry is None:
+            fitted, font = text_fit.fitter().fit(display_title(song), TITLE_WIDTH, self.row_font)
+            entry = self.text_cache[song] = [self.static_text(fitted, font), None, None, None, font]
+        total = self.game.total_scores[song]
+        current = self.game.current_scores[song]
+        if entry[1] != (total, current):
+            entry[1] = (total, current)
+            entry[2] = self.static_text(str(total + current))
+            entry[3] = self.static_text(str(current)) if current else None
+        return entry
+
+    def sync_visible_cells(self, metrics, moved_songs, initial):
+        # There are no cells to bind: start row moves and repaint. Rows that move
+        # entirely outside the visible area (a jump through the history can move
+        # thousands) go straight to their slot.
+        if not initial:
+            start_x, start_y, songs_in_first_column = metrics
+            area = self.visible_area()
+            pitch = SONG_HEIGHT + CELL_SPACING
+            top = (area.top() - start_y) // pitch
+            bottom = (area.bottom() - start_y) // pitch
+
+            def row(rank):
+                return rank if rank < songs_in_first_column else rank - songs_in_first_column
+            for song, old_rank in moved_songs.items():
+                new_rank = self.rank_index.rank(song)
+                first, last = sorted((row(old_rank), row(new_rank)))
+                if first <= bottom and last >= top:
+                    self.animator.move(song, self.slot_rect(old_rank, metrics), self.slot_rect(new_rank, metrics))
+                else:
+                    self.animator.cancel(song)
+        self.update()
+
+    def apply_moves(self, frame):
+        self.update()
+
+    def on_moves_finished(self, songs):
+        pass
+
+    def row_rect(self, song, rank, metrics, now):
+        rect = self.animator.current(song, now)
+        if rect is None:
+            rect = self.slot_rect(rank, metrics)
+        return rect
+
+    @timed("PaintedSpectatorContainer.paintEvent")
+    def paintEvent(self, event):
+        painter = QtGui.QPainter(self)
+        self.paint_background(painter)
+        self.mark_frame()
+        painter.setFont(self.row_font)
+        painter.setPen(QtCore.Qt.white)
+        metrics = self.layout_metrics()
+        now = self.animator.clock()
+        rows = {self.rank_index.song_at(rank): rank for rank in self.visible_ranks(metrics)}
+        for song in self.animator.moves:
+            rows.setdefault(song, None)
+        clip = event.rect()
+        for song, rank in rows.items():
+            rect = self.row_rect(song, rank, metrics, now)
+            if rect.intersects(clip):
+                self.paint_row(painter, song, rect)
+
+    def paint_row(self, painter, song, rect):
+        title, _, total_text, badge_text, font = self.row_text(song)
+        left = QtCore.QRect(rect.x(), rect.y(), LEFT_WIDTH, rect.height())
+        right = QtCore.QRect(rect.x() + LEFT_WIDTH, rect.y(), rect.width() - LEFT_WIDTH, rect.height())
+        painter.fillRect(left, self.LEFT_COLOR)
+        painter.fillRect(right, self.RIGHT_COLOR)
+
+        # LEFT sector: the total points, centered.
+        size = total_text.size()
+        painter.drawStaticText(QtCore.QPointF(
+            left.x() + (left.width() - size.width()) / 2,
+            left.y() + (left.height() - size.height()) / 2
+        ), total_text)
+
+        # RIGHT sector: the title and, during a turn, the point badge.
+        painter.save()
+        painter.setClipRect(right)
+        size = title.size()
+        x = right.x() + TITLE_INDENT
+        painter.setFont(font)
+        painter.drawStaticText(QtCore.QPointF(x, right.y() + (right.height() - size.height()) / 2), title)
+        painter.setFont(self.row_font)
+        if badge_text is not None:
+            badge_size = badge_text.size()
+            badge = QtCore.QRectF(
+                x + size.width() + self.BADGE_GAP,
+                right.y() + (right.height() - badge_size.height()) / 2 - self.BADGE_PADDING.top(),
+                badge_size.width() + self.BADGE_PADDING.left() + self.BADGE_PADDING.right(),
+                badge_size.height() + self.BADGE_PADDING.top() + self.BADGE_PADDING.bottom()
+            )
+            painter.fillRect(badge, self.BADGE_COLOR)
+            painter.drawStaticText(QtCore.QPointF(
+                badge.x() + self.BADGE_PADDING.left(), badge.y() + self.BADGE_PADDING.top()
+            ), badge_text)
+        painter.restore()
+
+
+class PerfOverlay(QtWidgets.QLabel):
+    """Live profiler readout (frame rate, dropped frames, vote-to-render latency) drawn over the board."""
+    REFRESH_INTERVAL = 500  # ms
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setFont(resources.font("Menlo", 12))
+        self.setObjectName("perfOverlay")
+        self.setAttribute(QtCore.Qt.WA_TransparentForMouseEvents)
+        self.timer = QtCore.QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+
+    def showEvent(self, event):
+        self.refresh()
+        self.timer.start(self.REFRESH_INTERVAL)
+
+    def hideEvent(self, event):
+        self.timer.stop()
+
+    def refresh(self):
+        def ms(value):
+            return "-" if value is None else f"{value:.1f}"
+        lines = [f"FPS {profiler.fps():.0f}   dropped {profiler.dropped_frames}"]
+        summary = profiler.summary()
+        vote = summary.get("vote_to_render")
+        if vote:
+            lines.append(f"vote→render p50 {ms(vote['p50'])} ms  p99 {ms(vote['p99'])} ms")
+        for name in ("SpectatorContainer.update_layout", "SpectatorContainer.paintEvent",
+                     "PaintedSpectatorContainer.paintEvent", "Game.finalize_turn"):
+            stats = summary.get(name)
+            if stats:
+                lines.append(f"{name.split('.')[-1]} p50 {ms(stats['p50'])} ms  p99 {ms(stats['p99'])} ms")
+        self.setText("\n".join(lines))
+        self.adjustSize()
+        self.raise_()
+
+
 class SpectatorWindow(QtWidgets.QMainWindow):
-    def __init__(self, game):
+    def __init__(self, game, virtual=None, painted=False):
+        """
+        virtual=None virtualizes the board automatically for large song lists;
+        painted=True draws the whole board in one paintEvent (always virtual).
+        """
         super().__init__()
         self.game = game
         self.setWindowTitle("Spectator Window")
@@ -280,18 +656,77 @@ class SpectatorWindow(QtWidgets.QMainWindow):
         self.scroll_area.setWidgetResizable(True)
         self.setCentralWidget(self.scroll_area)
 
-        self.container = SpectatorContainer(self.game)
+        if painted:
+            self.container = PaintedSpectatorContainer(self.game)
+        else:
+            if virtual is None:
+                virtual = len(self.game.songs) > VIRTUALIZE_ABOVE
+            self.container = SpectatorContainer(self.game, virtual=virtual)
         self.scroll_area.setWidget(self.container)
+        if self.container.virtual:
+            self.scroll_area.verticalScrollBar().valueChanged.connect(self.update_viewport)
+            self.scroll_area.horizontalScrollBar().valueChanged.connect(self.update_viewport)
+            self.scroll_area.viewport().installEventFilter(self)
+
+        # Presenter updates are recorded here and applied at most once per frame.
+        self.scheduler = RefreshScheduler(self.apply_refresh, self)
+
+        # Performance overlay, toggled with F3 (see set_perf_overlay).
+        self.perf_overlay = PerfOverlay(self)
+        self.perf_overlay.move(10, 10)
+        self.perf_overlay.hide()
+
+    def update_viewport(self):
+        viewport = self.scroll_area.viewport()
+        self.container.set_viewport(QtCore.QRect(
+            self.scroll_area.horizontalScrollBar().value(),
+            self.scroll_area.verticalScrollBar().value(),
+            viewport.width(),
+            viewport.height()
+        ))
+
+    def eventFilter(self, obj, event):
+        # Track viewport resizes so the bound cells always cover the visible area.
+        if obj is self.scroll_area.viewport() and event.type() == QtCore.QEvent.Resize:
+            self.update_viewport()
+        return super().eventFilter(obj, event)
 
     def update_view(self):
-        self.container.update_cells()
+        self.scheduler.request(RefreshScheduler.SCORES | RefreshScheduler.ORDER)
 
     def update_status(self, status_text):
-        self.container.info_cell.update_status(status_text)
+        self.scheduler.request(RefreshScheduler.STATUS, status=status_text)
 
     def update_last_voted(self, song):
-        """Delegate update of the last voted song to the container."""
-        self.container.update_last_voted(song)
+        """Record the last voted song; the container shows it on the next refresh."""
+        self.container.last_voted_song = song
+        self.scheduler.request(RefreshScheduler.HIGHLIGHT | RefreshScheduler.SCORES | RefreshScheduler.ORDER)
+
+    def apply_refresh(self, changes, status):
+        """Applies one coalesced update from the refresh scheduler."""
+        if changes & (RefreshScheduler.SCORES | RefreshScheduler.HIGHLIGHT):
+            self.container.refresh_cells()
+        if changes & (RefreshScheduler.SCORES | RefreshScheduler.ORDER):
+            self.container.update_layout(initial=False)
+        if changes & RefreshScheduler.STATUS:
+            self.container.info_cell.update_status(status)
+
+    def set_reduced_motion(self, enabled):
+        """Rank changes jump straight to their new slot instead of animating."""
+        self.container.animator.set_reduced_motion(enabled)
+
+    def set_perf_overlay(self, enabled):
+        """Shows or hides the performance overlay; showing it turns the profiler on."""
+        if enabled:
+            profiler.enable()
+        self.perf_overlay.setVisible(enabled)
+
+    def keyPressEvent(self, event):
+        if event.key() == QtCore.Qt.Key_F3:
+            self.set_perf_overlay(not self.perf_overlay.isVisible())
+        else:
+            super().keyPressEvent(event)
 
     def set_background(self, customizer):
-        customizer.apply_background(self.container)
+        # Scaled to the viewport, not to the board: a virtual board is as tall as all its rows.
+        customizer.apply_background(self.container, self.scroll_area.viewport())
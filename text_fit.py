@@ -0,0 +1,108 @@
+# text_fit.py
+import collections
+import time
+
+from PyQt5 import QtCore, QtGui
+
+import resources
+
+MIN_POINT_SIZE = 24  # Titles are shrunk down to this size, then elided
+
+
+class TextFitter(QtCore.QObject):
+    """
+    Fits titles into a given width: the largest point size (from the font's
+    own size down to MIN_POINT_SIZE) at which the title fits, or, when even
+    that is too wide, the title elided at MIN_POINT_SIZE.
+
+    Results are kept in an LRU cache keyed by (text, width, font) and
+    QFontMetrics are created once per font, so a cached fit costs a dict
+    lookup. precompute() fills the cache for a list of titles in small
+    chunks while the event loop is idle.
+    """
+    IDLE_BUDGET = 0.004  # Seconds of precomputation per event-loop pass
+
+    def __init__(self, capacity=20000, parent=None):
+        super().__init__(parent)
+        self.capacity = capacity
+        self.fits = collections.OrderedDict()  # (text, width, font key) -> (text, QFont)
+        self.metrics_cache = {}                # font key -> QFontMetrics
+        self.job = None                        # Iterator of pending precomputations
+        self.job_scheduled = False
+        self.measured = 0                      # Fits computed (cache misses)
+
+    @staticmethod
+    def font_key(font):
+        return font.family(), font.pointSize(), font.bold()
+
+    def metrics(self, key):
+        metrics = self.metrics_cache.get(key)
+        if metrics is None:
+            metrics = self.metrics_cache[key] = QtGui.QFontMetrics(resources.font(*key))
+        return metrics
+
+    def fit(self, text, width, font):
+        """(text to show, font to show it in) for text in at most width pixels."""
+        key = (text, width, self.font_key(font))
+        result = self.fits.get(key)
+        if result is not None:
+            self.fits.move_to_end(key)
+            return result
+        result = self.fits[key] = self.compute(text, width, key[2])
+        if len(self.fits) > self.capacity:
+            self.fits.popitem(last=False)
+        return result
+
+    def compute(self, text, width, font_key):
+        self.measured += 1
+        family, size, bold = font_key
+        advance = self.metrics(font_key).horizontalAdvance(text)
+        if advance <= width:
+            return text, resources.font(family, size, bold)
+        # Text width scales almost linearly with the point size: start from the
+        # estimate and step down until it really fits.
+        size = min(size - 1, int(size * width / advance))
+        while size >= MIN_POINT_SIZE:
+            if self.metrics((family, size, bold)).horizontalAdvance(text) <= width:
+                return text, resources.font(family, size, bold)
+            size -= 1
+        small = (family, MIN_POINT_SIZE, bold)
+        return self.metrics(small).elidedText(text, QtCore.Qt.ElideRight, width), resources.font(*small)
+
+    def precompute(self, texts, width, font):
+        """Fits texts (any iterable) for width in the background; replaces a previous job."""
+        font_key = self.font_key(font)
+        self.job = ((text, width, font_key) for text in texts)
+        self.schedule_job()
+
+    def schedule_job(self):
+        if not self.job_scheduled:
+            self.job_scheduled = True
+            QtCore.QTimer.singleShot(0, self.run_job)
+
+    def run_job(self):
+        self.job_scheduled = False
+        if self.job is None:
+            return
+        deadline = time.perf_counter() + self.IDLE_BUDGET
+        for text, width, font_key in self.job:
+            key = (text, width, font_key)
+            if key not in self.fits:
+                self.fits[key] = self.compute(text, width, font_key)
+                if len(self.fits) > self.capacity:
+                    self.fits.popitem(last=False)
+            if time.perf_counter() >= deadline:
+                self.schedule_job()
+                return
+        self.job = None
+
+
+_fitter = None
+
+
+def fitter():
+    """The application's shared TextFitter."""
+    global _fitter
+    if _fitter is None:
+        _fitter = TextFitter()
+    return _fitter
@@ -0,0 +1,233 @@
+# vote_server.py
+import asyncio
+import collections
+import http.client
+import json
+import threading
+
+from PyQt5 import QtCore
+
+
+class BallotBridge(QtCore.QObject):
+    """
+    Thread-safe hand-over of validated ballots from the vote server to the Qt
+    event loop.
+
+    The server thread only appends to a deque and wakes the GUI thread with
+    a queued signal (once per batch, not once per ballot). The GUI thread
+    then collects every ballot in the game (Game.submit_ballot), where it
+    waits for its juror's turn; the presenter's RevealSequencer or its
+    Reveal Next button brings the ballots onto the board in player order.
+    """
+    ballots_ready = QtCore.pyqtSignal()
+
+    def __init__(self, presenter, parent=None):
+        super().__init__(parent)
+        self.presenter = presenter
+        self.game = presenter.game
+        self.queue = collections.deque()  # (juror, key, ballot), filled by the server thread
+        self.queued = {}  # juror -> idempotency key of their ballot in the queue
+        self.keys = {}    # juror -> idempotency key of their collected ballot
+        self.wake_pending = False
+        self.collected = 0
+        self.rejected = 0
+        self.ballots_ready.connect(self.drain)
+
+    def pending_count(self):
+        return len(self.queue) + len(self.game.pending_ballots)
+
+    def submit(self, juror, key, ballot):
+        """Called from the server thread."""
+        self.queued[juror] = key
+        self.queue.append((juror, key, ballot))
+        if not self.wake_pending:
+            self.wake_pending = True
+            self.ballots_ready.emit()
+
+    def drain(self):
+        self.wake_pending = False
+        while self.queue:
+            juror, key, ballot = self.queue.popleft()
+            try:
+                self.game.submit_ballot(juror, ballot)
+                self.keys[juror] = key
+                self.collected += 1
+            except ValueError:
+                # The juror's turn was played by hand meanwhile; the key is not kept.
+                self.rejected += 1
+            # Only now, so that the server always finds the key in one of the two.
+            del self.queued[juror]
+
+
+class VoteServer:
+    """
+    Local HTTP endpoint for juror ballots, served by asyncio in a background thread.
+
+        POST /ballot  {"juror": "Alice", "key": "...", "ballot": [["Song", 9], ...]}
+        GET  /status
+
+    A ballot must come from a known juror who has not voted yet, name known
+    songs and use exactly the values of Game.points_sequence. The
+    idempotency key makes retries safe: the same (juror, key) is accepted
+    once, and a different ballot from the same juror is refused while the
+    first one is queued or collected. A ballot the game rejects (see
+    BallotBridge.drain) does not count, and the juror may vote again. When more
+    than max_pending ballots are waiting to be applied, new ones get 429 so
+    clients back off.
+    """
+    def __init__(self, bridge, host="127.0.0.1", port=8765, max_pending=10000):
+        self.bridge = bridge
+        self.game = bridge.game
+        self.host = host
+        self.port = port
+        self.max_pending = max_pending
+        # Immutable copies used for validation off the GUI thread.
+        self.songs = frozenset(self.game.original_order)
+        self.player_index = {player: i for i, player in enumerate(self.game.players)}
+        self.points = sorted(self.game.points_sequence)
+        self.loop = None
+        self.server = None
+        self.connections = {}  # Task serving each open (keep-alive) connection -> its writer
+        self.thread = None
+        self.started = threading.Event()
+
+    # --- Lifecycle ---
+    def start(self):
+        """Starts serving in a background thread; self.port holds the bound port afterwards."""
+        self.thread = threading.Thread(target=self.run, name="vote-server", daemon=True)
+        self.thread.start()
+        self.started.wait()
+
+    def run(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.server = self.loop.run_until_complete(
+            asyncio.start_server(self.handle_connection, self.host, self.port)
+        )
+        self.port = self.server.sockets[0].getsockname()[1]
+        self.started.set()
+        try:
+            self.loop.run_forever()
+        finally:
+            self.loop.run_until_complete(self.shutdown())
+            self.loop.close()
+
+    async def shutdown(self):
+        """Stops accepting, then ends the connections still open (idle keep-alives included)."""
+        self.server.close()
+        # Closing the transports ends each handler at its next read, without
+        # cancelling tasks the stream protocol still watches.
+        for writer in self.connections.values():
+            writer.close()
+        await asyncio.gather(*self.connections, return_exceptions=True)
+        await self.server.wait_closed()
+
+    def stop(self):
+        if self.loop is not None and self.loop.is_running():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.thread.join()
+
+    # --- HTTP ---
+    async def handle_connection(self, reader, writer):
+        task = asyncio.current_task()
+        self.connections[task] = writer
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                status, payload = self.handle_request(method, path, body)
+                data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                keep_alive = headers.get("connection", "").lower() != "close"
+                writer.write(
+                    f"HTTP/1.1 {status} {http.client.responses[status]}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1")
+                    + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ValueError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.connections.pop(task, None)
+            writer.close()
+
+    def handle_request(self, method, path, body):
+        if method == "GET" and path == "/status":
+            return 200, {
+                "current_player": self.game.get_current_player(),
+                "game_over": self.game.game_over,
+                "pending": self.bridge.pending_count(),
+            }
+        if method == "POST" and path == "/ballot":
+            try:
+                request = json.loads(body)
+            except ValueError:
+                return 400, {"error": "Body is not valid JSON"}
+            if not isinstance(request, dict) or not isinstance(request.get("juror"), str):
+                return 400, {"error": "Body must be an object with a juror name"}
+            return self.accept_ballot(request)
+        return 404, {"error": "Not found"}
+
+    def accept_ballot(self, request):
+        juror = request.get("juror")
+        key = request.get("key")
+        if not isinstance(key, str) or not key:
+            return 400, {"error": "Missing idempotency key"}
+        accepted = self.bridge.keys.get(juror) or self.bridge.queued.get(juror)
+        if accepted == key:
+            return 200, {"status": "duplicate"}
+        if accepted is not None:
+            return 409, {"error": f"{juror!r} has already submitted a ballot"}
+        error = self.validate(juror, request.get("ballot"))
+        if error:
+            return 400, {"error": error}
+        if self.bridge.pending_count() >= self.max_pending:
+            return 429, {"error": "Too many pending ballots, retry later"}
+        self.bridge.submit(juror, key, [(song, points) for song, points in request["ballot"]])
+        return 202, {"status": "queued"}
+
+    def validate(self, juror, ballot):
+        if juror not in self.player_index:
+            return f"Unknown juror {juror!r}"
+        if self.player_index[juror] < self.game.current_player_index or self.game.game_over:
+            return f"{juror!r} has already voted"
+        if not isinstance(ballot, list) or not all(
+                isinstance(entry, list) and len(entry) == 2 for entry in ballot):
+            return "Ballot must be a list of [song, points] pairs"
+        for song, points in ballot:
+            if not isinstance(song, str):
+                return f"Song must be a string, not {song!r}"
+            if not isinstance(points, int) or isinstance(points, bool):
+                return f"Points must be an integer, not {points!r}"
+        if sorted(points for _, points in ballot) != self.points:
+            return f"Ballot points must be {self.game.points_sequence}"
+        for song, _ in ballot:
+            if song not in self.songs:
+                return f"Unknown song {song!r}"
+        return None
+
+
+def submit_ballot(juror, ballot, key, host="127.0.0.1", port=8765, connection=None):
+    """Minimal client: posts one ballot and returns (status, response payload).
+    Pass an http.client.HTTPConnection to reuse one keep-alive connection."""
+    conn = connection or http.client.HTTPConnection(host, port)
+    body = json.dumps({"juror": juror, "key": key, "ballot": ballot}, ensure_ascii=False)
+    conn.request("POST", "/ballot", body.encode("utf-8"), {"Content-Type": "application/json"})
+    response = conn.getresponse()
+    payload = json.loads(response.read())
+    if connection is None:
+        conn.close()
+    return response.status, payload